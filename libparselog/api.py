@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+"""[summary]
+the library interface, parses and compares in process so the records never go through
+the command line, stdout or a JSON round trip
+
+    driver = open_driver(["my.toml"])
+    for key, record in iter_records(driver, ["a.log", "b.log"]):
+        ...
+    for entry, status, entries in iter_diff(driver, "golden.json", ["a.log", "b.log"]):
+        ...
+
+a driver can be reused for any number of calls and shared by threads, see ParseDriver
+"""
+
+# We use OrderedDict in place of dict to
+# keep the ordering from the toml
+from collections import OrderedDict
+from collections.abc import Mapping
+from functools import partial
+from typing import Any, Iterable, Iterator, Tuple, Union
+
+from libparselog.parsedriver import ParseDriver
+from libparselog.asyncload import prefetch
+from libparselog.loader import iter_entries, read_log, reads_by_key
+from libparselog.fingerprint import load_fingerprints
+
+
+def open_driver(
+    toml_file_list: list,
+    import_list=None,
+    preprocess_list=None,
+    process_list=None,
+    postprocess_list=None,
+) -> ParseDriver:
+    """builds a driver, the lists are the same as the command line options
+
+    Args:
+        toml_file_list (list): the toml configurations
+        import_list (list, optional): the python files holding the hooks and comparators
+        preprocess_list (list, optional): the preprocess hooks to run on each log
+        process_list (list, optional): the process hooks to run on each line
+        postprocess_list (list, optional): the postprocess hooks to run on each record
+
+    Returns:
+        ParseDriver: the driver
+    """
+    return ParseDriver(
+        toml_file_list,
+        import_list or [],
+        preprocess_list or [],
+        process_list or [],
+        postprocess_list or [],
+    )
+
+
+def iter_records(
+    driver: ParseDriver, file_list: Union[str, Iterable[str]], concurrency=0, read_ahead=64
+) -> Iterator[Tuple[str, Any]]:
+    """streams the keyed records of logs and tables, in the order of the inputs
+
+    Args:
+        driver (ParseDriver): the driver for the parse
+        file_list (Union[str, Iterable[str]]): a log or table, or any iterable of them
+        concurrency (int, optional): read that many logs ahead in the background, 0 reads
+            them as they are parsed. Defaults to 0.
+        read_ahead (int, optional): the most logs held in memory ahead of the parse
+
+    Yields:
+        Tuple[str, Any]: the key and the record
+    """
+    if isinstance(file_list, str):
+        file_list = [file_list]
+
+    if concurrency > 0:
+        read_fn = partial(read_log, driver)
+        for files, content in prefetch(file_list, read_fn, concurrency, read_ahead):
+            yield from iter_entries(driver, files, content)
+    else:
+        for files in file_list:
+            yield from iter_entries(driver, files)
+
+
+def load_records(driver: ParseDriver, source, keys=None) -> Mapping:
+    """the table of the source, a later record replaces an earlier one with the same key
+
+    Args:
+        driver (ParseDriver): the driver for the parse
+        source (Union[Mapping, str, Iterable[str]]): a table already in memory or the inputs
+        keys (Iterable[str], optional): only the entries we are after, for a sharded or
+            json lines table
+
+    Returns:
+        Mapping: the table
+    """
+    if isinstance(source, Mapping):
+        return source
+
+    if keys is not None and isinstance(source, str) and reads_by_key(source):
+        return OrderedDict(iter_entries(driver, source, keys=keys))
+
+    return OrderedDict(iter_records(driver, source))
+
+
+def iter_diff(
+    driver: ParseDriver, expected, got, subset=False, jobs=0
+) -> Iterator[Tuple[str, str, OrderedDict]]:
+    """streams the comparison of a golden against results, entry by entry, golden entries
+    first followed by the new ones. These are what a Reporter receives.
+
+    Args:
+        driver (ParseDriver): the driver for the comparison
+        expected (Union[Mapping, str, Iterable[str]]): the golden table or its inputs
+        got (Union[Mapping, str, Iterable[str]]): the resulting table or its inputs
+        subset (bool, optional): the results only cover part of the golden, missing entries
+            are skipped. Defaults to False.
+        jobs (int, optional): run the comparators in that many worker processes. Defaults to 0.
+
+    Yields:
+        Tuple[str, str, OrderedDict]: the entry, its status and the diff of its headers
+    """
+    fingerprints = None
+    if isinstance(expected, str):
+        fingerprints = load_fingerprints(expected, driver.get_header_list())
+
+    got = load_records(driver, got)
+    expected = load_records(driver, expected, keys=got.keys() if subset else None)
+
+    for entry, diff in driver.iter_diff(expected, got, fingerprints, jobs):
+        # subset are expected to have missing entries
+        if subset and diff["__STATUS__"] == "Missing":
+            continue
+
+        yield entry, diff["__STATUS__"], diff["__ENTRIES__"]
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+"""[summary]
+overlaps the reads of many inputs on high latency file systems, the parsing itself
+stays on the calling thread and sees the inputs in the order they were given
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Tuple
+
+
+def read_text(file_name: str) -> str:
+    with open(file_name) as input_file:
+        return input_file.read()
+
+
+def prefetch(
+    file_iter: Iterable[str],
+    read_fn: Callable[[str], Any] = read_text,
+    concurrency: int = 16,
+    read_ahead: int = 64,
+) -> Iterator[Tuple[str, Any]]:
+    """reads the inputs ahead of the consumer on a pool of threads, the reads block
+    on the file system and release the GIL so they overlap
+
+    Args:
+        file_iter (Iterable[str]): the inputs, consumed lazily
+        read_fn (Callable[[str], Any], optional): blocking function loading one input.
+            Defaults to reading it as text.
+        concurrency (int, optional): how many reads can be in flight at once. Defaults to 16.
+        read_ahead (int, optional): how many inputs can be loaded before they are consumed.
+            Defaults to 64.
+
+    Yields:
+        Tuple[str, Any]: the input name and what read_fn returned for it, in input order
+    """
+    concurrency = max(1, concurrency)
+    read_ahead = max(concurrency, read_ahead)
+
+    # Executor.map would take every input at once, the window keeps the inputs lazy
+    # and bounds what is held in memory
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        try:
+            for file_name in file_iter:
+                pending.append((file_name, executor.submit(read_fn, file_name)))
+                if len(pending) >= read_ahead:
+                    file_name, future = pending.popleft()
+                    yield file_name, future.result()
+
+            while len(pending) > 0:
+                file_name, future = pending.popleft()
+                yield file_name, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
@@ -6,16 +6,17 @@
 # We use OrderedDict in place of dict to
 # keep the ordering from the toml
 from collections import OrderedDict
+from array import array
 from libparselog.utils import sanitize_value
 import sys
 
 
 class Comparator:
 
-    fn_tbl = dict()
+    fn_tbl = None
 
     def __init__(self, fn_table=None):
-        self.fn_tbl = fn_table
+        self.fn_tbl = fn_table if fn_table is not None else dict()
 
     def _compare_values(self, comparator_fn, compare_args, expected, got):
         # convert to a number if possible
@@ -37,7 +38,8 @@ class Comparator:
         if got is None or expected is None:
             return False
 
-        if isinstance(got, list) and isinstance(expected, list):
+        # the numeric series are compared as the lists they are written as
+        if isinstance(got, (list, array)) and isinstance(expected, (list, array)):
             # make sure we have the same number of items
             if len(got) != len(expected):
                 return False
@@ -48,7 +50,7 @@ class Comparator:
 
             return True
 
-        if isinstance(got, list) or isinstance(expected, list):
+        if isinstance(got, (list, array)) or isinstance(expected, (list, array)):
             return False
 
         return self._compare_values(comparator_fn, compare_args, expected, got)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+"""[summary]
+transparent compression of the tables, the codec is picked from the file extension
+ie: golden.json.gz or result.csv.xz, and the data is streamed through it both ways
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import sys
+
+# zstandard is optional, it is the only codec compressing on multiple threads
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP = ".gz"
+XZ = ".xz"
+BZIP2 = ".bz2"
+ZSTD = ".zst"
+
+CODECS = [GZIP, XZ, BZIP2, ZSTD]
+
+
+def compression_of(file_name: str) -> str:
+    """
+    Args:
+        file_name (str): the file
+
+    Returns:
+        str: the codec extension of the file or None when it is not compressed
+    """
+    for codec in CODECS:
+        if file_name.endswith(codec):
+            return codec
+
+    return None
+
+
+def strip_compression(file_name: str) -> str:
+    """the file name without its codec extension, ie: what format the table is in"""
+    codec = compression_of(file_name)
+    if codec is None:
+        return file_name
+
+    return file_name[: -len(codec)]
+
+
+def _open_zstd(file_name, mode, level, threads):
+    if zstandard is None:
+        print("ERROR: " + file_name + " needs the zstandard package to be installed")
+        sys.exit(255)
+
+    if "r" in mode:
+        # buffered so the lines can be iterated over
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(file_name, "rb")))
+
+    compressor = zstandard.ZstdCompressor(level=level if level is not None else 3, threads=threads)
+    return compressor.stream_writer(open(file_name, mode))
+
+
+def _open_binary(file_name, mode, level, threads):
+    codec = compression_of(file_name)
+    if codec == GZIP:
+        return gzip.open(file_name, mode, compresslevel=level if level is not None else 9)
+
+    if codec == XZ:
+        if "r" in mode:
+            return lzma.open(file_name, mode)
+
+        return lzma.open(file_name, mode, preset=level)
+
+    if codec == BZIP2:
+        return bz2.open(file_name, mode, compresslevel=level if level is not None else 9)
+
+    if codec == ZSTD:
+        return _open_zstd(file_name, mode, level, threads)
+
+    return open(file_name, mode)
+
+
+def open_table(file_name: str, mode="r", level=None, threads=0):
+    """opens a table, compressed or not
+
+    Args:
+        file_name (str): the table
+        mode (str, optional): r, w or a, with b for bytes. Defaults to "r".
+        level (int, optional): the compression level, the codec default when None
+        threads (int, optional): compress on that many threads when the codec can (zstd)
+
+    Returns:
+        the file object
+    """
+    binary_mode = mode.replace("+", "").replace("t", "")
+    if "b" not in binary_mode:
+        binary_mode += "b"
+
+    if compression_of(file_name) is None:
+        if "b" in mode:
+            return open(file_name, binary_mode)
+
+        return open(file_name, mode, newline="" if "r" in mode else None)
+
+    stream = _open_binary(file_name, binary_mode, level, threads)
+    if "b" in mode:
+        return stream
+
+    return io.TextIOWrapper(stream, encoding="utf-8", newline="" if "r" in mode else None)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+"""[summary]
+streams the input file names to the loader, from the command line,
+from manifests or stdin and by walking directories
+"""
+
+import sys
+import os
+
+from fnmatch import fnmatch
+from typing import Iterator
+
+from libparselog.shards import is_sharded
+
+_CHUNK_SIZE = 1 << 16
+
+
+def _matches(path: str, name: str, glob_list) -> bool:
+    for globs in glob_list:
+        if fnmatch(name, globs) or fnmatch(path, globs):
+            return True
+
+    return False
+
+
+def walk_files(directory: str, include=None, exclude=None) -> Iterator[str]:
+    """walks a directory tree with os.scandir, the files are yielded as they are found
+
+    Args:
+        directory (str): the root of the walk
+        include (list, optional): globs a file must match to be yielded, all files when empty
+        exclude (list, optional): globs pruning matching files and directories
+
+    Yields:
+        str: the path to the file
+    """
+    include = include or []
+    exclude = exclude or []
+
+    pending = [directory]
+    while len(pending) > 0:
+        current_dir = pending.pop()
+        try:
+            entries = sorted(os.scandir(current_dir), key=lambda entry: entry.name)
+        except OSError as err:
+            print("WARNING: unable to read " + current_dir + ": " + str(err), file=sys.stderr)
+            continue
+
+        sub_dirs = []
+        for entry in entries:
+            if _matches(entry.path, entry.name, exclude):
+                continue
+
+            # do not follow links to directories, to avoid walking in circles,
+            # nor yield them as they are not files either
+            if entry.is_dir(follow_symlinks=False):
+                sub_dirs.append(entry.path)
+            elif not entry.is_file():
+                continue
+            elif len(include) == 0 or _matches(entry.path, entry.name, include):
+                yield entry.path
+
+        # the stack is reversed so the walk stays in sorted order
+        pending += reversed(sub_dirs)
+
+
+def read_manifest(file_name: str, null_separated=False) -> Iterator[str]:
+    """reads a list of inputs, one per line or NUL separated, '-' reads from stdin
+
+    Args:
+        file_name (str): the manifest file
+        null_separated (bool, optional): entries are separated by NUL rather than newlines
+
+    Yields:
+        str: each entry of the manifest
+    """
+    manifest = sys.stdin
+    if file_name != "-":
+        manifest = open(file_name, newline="")
+
+    try:
+        if not null_separated:
+            for line in manifest:
+                line = line.rstrip("\r\n")
+                if line != "":
+                    yield line
+        else:
+            remainder = ""
+            for chunk in iter(lambda: manifest.read(_CHUNK_SIZE), ""):
+                entries = (remainder + chunk).split("\0")
+                remainder = entries.pop()
+                for entry in entries:
+                    if entry != "":
+                        yield entry
+
+            if remainder.strip() != "":
+                yield remainder.strip()
+    finally:
+        if manifest is not sys.stdin:
+            manifest.close()
+
+
+def iter_inputs(
+    file_list, manifest_list=None, null_separated=False, include=None, exclude=None
+) -> Iterator[str]:
+    """streams every input file, directories are walked and manifests are expanded lazily
+
+    Args:
+        file_list (list): files or directories
+        manifest_list (list, optional): manifests listing more files or directories
+        null_separated (bool, optional): the manifests are NUL separated
+        include (list, optional): globs selecting the files found in directories
+        exclude (list, optional): globs pruning the files and directories found in directories
+
+    Yields:
+        str: the path to each input
+    """
+
+    def _expand(path_list):
+        for path in path_list:
+            # a sharded table is a single input, not a directory of them
+            if os.path.isdir(path) and not is_sharded(path):
+                yield from walk_files(path, include, exclude)
+            else:
+                yield path
+
+    yield from _expand(file_list)
+
+    if manifest_list is not None:
+        for manifest in manifest_list:
+            yield from _expand(read_manifest(manifest, null_separated))
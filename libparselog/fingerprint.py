@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""[summary]
+fingerprints of the rows of a table, two rows with the same fingerprint hold the same values
+so comparing them can be skipped. The fingerprints of a table can be kept in a sidecar file
+next to it to skip hashing the golden on every comparison.
+"""
+
+# We use OrderedDict in place of dict to
+# keep the ordering from the toml
+from collections import OrderedDict
+
+import os
+
+from hashlib import blake2b
+from json import dumps as jsonDumps
+from typing import Iterable, Mapping
+
+from libparselog.utils import dump_json, json_default, load_json
+
+FINGERPRINT_EXT = ".fp"
+
+_K_SIZE = "size"
+_K_MTIME = "mtime"
+_K_HEADERS = "headers"
+_K_ROWS = "rows"
+
+
+def _digest(value) -> str:
+    return blake2b(
+        jsonDumps(value, default=json_default, sort_keys=True).encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+def fingerprint_row(header_list: Iterable[str], row: Mapping) -> str:
+    """a missing header reads as None, as it does when diffing
+
+    Args:
+        header_list (Iterable[str]): the headers of the table, in order
+        row (Mapping): the row
+
+    Returns:
+        str: the fingerprint of the row
+    """
+    return _digest([row[header] if header in row else None for header in header_list])
+
+
+def _stamp(file_name: str) -> tuple:
+    # a sidecar trusted for a table it does not describe would hide differences,
+    # so it must match the size and the modification time of the table
+    stat = os.stat(file_name)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def dump_fingerprints(file_name: str, header_list: Iterable[str], fingerprints: Mapping):
+    """writes the sidecar of a table, once the table itself is written
+
+    Args:
+        file_name (str): the table
+        header_list (Iterable[str]): the headers the fingerprints were computed on
+        fingerprints (Mapping): the fingerprint of each entry
+    """
+    sidecar = OrderedDict()
+    sidecar[_K_SIZE], sidecar[_K_MTIME] = _stamp(file_name)
+    sidecar[_K_HEADERS] = _digest(list(header_list))
+    sidecar[_K_ROWS] = fingerprints
+    with open(file_name + FINGERPRINT_EXT, "w+") as sidecar_file:
+        dump_json(sidecar, file=sidecar_file)
+
+
+def load_fingerprints(file_name: str, header_list: Iterable[str]) -> OrderedDict:
+    """loads the sidecar of a table, a sidecar that does not match the table or the
+    headers is ignored
+
+    Args:
+        file_name (str): the table
+        header_list (Iterable[str]): the headers of the current configuration
+
+    Returns:
+        OrderedDict: the fingerprint of each entry or None
+    """
+    if not os.path.isfile(file_name) or not os.path.isfile(file_name + FINGERPRINT_EXT):
+        return None
+
+    sidecar = load_json(file_name + FINGERPRINT_EXT)
+    stale = (sidecar.get(_K_SIZE), sidecar.get(_K_MTIME)) != _stamp(file_name)
+    if stale or sidecar.get(_K_HEADERS) != _digest(list(header_list)):
+        return None
+
+    return sidecar[_K_ROWS]
@@ -6,30 +6,26 @@
 # We use OrderedDict in place of dict to
 # keep the ordering from the toml
 from collections import OrderedDict
+from time import perf_counter
 
 
 class Hooks:
-    """[summary]
-
-    Returns:
-        [type]: [description]
+    """the functions run on the log file, on each line and on each parsed record.
+    Every instance holds its own lists so drivers built in the same process stay apart.
     """
 
-    preprocess = [
-        # no functions registered
-    ]
-
-    process = [
-        # no functions registered
-    ]
-
-    postprocess = [
-        # no functions registered
-    ]
+    profiler = None
 
     def __init__(
         self, function_table=None, preprocess_list=None, process_list=None, postprocess_list=None
     ):
+        self.preprocess = []
+        self.process = []
+        self.postprocess = []
+
+        # the compiled TRANSFORM of the toml, run ahead of the process hooks
+        self.transform = None
+
         if preprocess_list is not None:
             for fn_name in preprocess_list:
                 if fn_name in function_table:
@@ -62,7 +58,12 @@ class Hooks:
             file_input.seek(0, 0)
             file_to_return = file_name + ".preproc_" + str(preproc_count)
             file_output = open(file_to_return, "w+")
-            hook_fn(file_input, file_output)
+            if self.profiler is not None:
+                start = perf_counter()
+                hook_fn(file_input, file_output)
+                self.profiler.add_hook("preprocess", hook_fn.__name__, perf_counter() - start)
+            else:
+                hook_fn(file_input, file_output)
             file_input.close()
             file_input = file_output
 
@@ -78,6 +79,17 @@ class Hooks:
         Returns:
             str: the line once all the processing as been done
         """
+        if self.profiler is not None:
+            if self.transform is not None:
+                start = perf_counter()
+                line = self.transform(line)
+                self.profiler.add_hook("process", "TRANSFORM", perf_counter() - start)
+
+            return self._do_profiled("process", self.process, line)
+
+        if self.transform is not None:
+            line = self.transform(line)
+
         for hook_fn in self.process:
             line = hook_fn(line)
 
@@ -92,7 +104,18 @@ class Hooks:
         Returns:
             OrderedDict: the reodered dataset
         """
+        if self.profiler is not None:
+            return self._do_profiled("postprocess", self.postprocess, dataset)
+
         for hook_fn in self.postprocess:
             dataset = hook_fn(dataset)
 
         return dataset
+
+    def _do_profiled(self, kind: str, hook_list: list, value):
+        for hook_fn in hook_list:
+            start = perf_counter()
+            value = hook_fn(value)
+            self.profiler.add_hook(kind, hook_fn.__name__, perf_counter() - start)
+
+        return value
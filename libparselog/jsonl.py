@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+
+"""[summary]
+json lines tables, one { key: entry } object per line. A { "DEFAULT": table } record applies
+to the entries that follow it, up to the next one, so files can be appended to and concatenated
+as is. A sidecar index maps each key to the byte offset of its line for random access,
+compressed tables have no index and are always streamed.
+"""
+
+# We use OrderedDict in place of dict to
+# keep the ordering from the toml
+from collections import OrderedDict
+
+import os
+
+from bisect import bisect_right
+from json import dumps as jsonDumps
+from json import loads as jsonLoads
+from typing import Any, Iterable, Iterator, Tuple
+
+from libparselog.utils import dump_json, json_default, load_json
+from libparselog.compression import compression_of, open_table
+
+DEFAULT = "DEFAULT"
+INDEX_EXT = ".idx"
+
+_K_SIZE = "size"
+_K_DEFAULTS = "defaults"
+_K_KEYS = "keys"
+
+
+def _encode(key: str, value: Any) -> bytes:
+    return (jsonDumps({key: value}, default=json_default) + "\n").encode("utf-8")
+
+
+def _decode(line: bytes) -> Tuple[str, Any]:
+    record = jsonLoads(line, object_pairs_hook=OrderedDict)
+    return next(iter(record.items()))
+
+
+def _new_index() -> OrderedDict:
+    index = OrderedDict()
+    index[_K_SIZE] = 0
+    index[_K_DEFAULTS] = []
+    index[_K_KEYS] = OrderedDict()
+    return index
+
+
+def load_index(file_name: str) -> OrderedDict:
+    """loads the sidecar index, an index that does not match the file is ignored
+
+    Args:
+        file_name (str): the json lines table
+
+    Returns:
+        OrderedDict: the index or None
+    """
+    if compression_of(file_name) is not None or not os.path.isfile(file_name + INDEX_EXT):
+        return None
+
+    index = load_json(file_name + INDEX_EXT)
+    if index.get(_K_SIZE) != os.path.getsize(file_name):
+        return None
+
+    return index
+
+
+def dump_jsonl(
+    items: Iterable[Tuple[str, Any]],
+    file_name: str,
+    default_tbl=None,
+    append=False,
+    level=None,
+    threads=0,
+):
+    """streams the entries to a json lines table and writes its index
+
+    Args:
+        items (Iterable[Tuple[str, Any]]): the (key, entry) pairs to write
+        file_name (str): the json lines table
+        default_tbl (OrderedDict, optional): the DEFAULT record for these entries
+        append (bool, optional): append to the table rather than overwriting it
+        level (int, optional): the compression level of a compressed table
+        threads (int, optional): the compression threads of a compressed table
+    """
+    if compression_of(file_name) is not None:
+        # compressed streams can be appended to but not seeked into, so no index
+        with open_table(file_name, "ab" if append else "wb", level, threads) as jsonl_file:
+            if default_tbl is not None:
+                jsonl_file.write(_encode(DEFAULT, default_tbl))
+
+            for key, value in items:
+                jsonl_file.write(_encode(key, value))
+
+        return
+
+    index = None
+    if append and os.path.isfile(file_name):
+        index = load_index(file_name)
+        if index is None:
+            index = build_index(file_name)
+    else:
+        append = False
+
+    if index is None:
+        index = _new_index()
+
+    with open(file_name, "ab" if append else "wb") as jsonl_file:
+        offset = index[_K_SIZE]
+
+        if default_tbl is not None:
+            index[_K_DEFAULTS].append(offset)
+            offset += jsonl_file.write(_encode(DEFAULT, default_tbl))
+
+        for key, value in items:
+            index[_K_KEYS][key] = offset
+            offset += jsonl_file.write(_encode(key, value))
+
+        index[_K_SIZE] = offset
+
+    with open(file_name + INDEX_EXT, "w+") as index_file:
+        dump_json(index, file=index_file)
+
+
+def build_index(file_name: str) -> OrderedDict:
+    """rebuilds the index of a table by scanning it
+
+    Args:
+        file_name (str): the json lines table
+
+    Returns:
+        OrderedDict: the index
+    """
+    index = _new_index()
+    with open(file_name, "rb") as jsonl_file:
+        offset = 0
+        for line in jsonl_file:
+            if line.strip() != b"":
+                key, _ = _decode(line)
+                if key == DEFAULT:
+                    index[_K_DEFAULTS].append(offset)
+                else:
+                    index[_K_KEYS][key] = offset
+
+            offset += len(line)
+
+        index[_K_SIZE] = offset
+
+    return index
+
+
+def iter_jsonl(file_name: str, keys=None) -> Iterator[Tuple[str, Any]]:
+    """streams a json lines table, the DEFAULT records are yielded where they apply
+
+    Args:
+        file_name (str): the json lines table
+        keys (Iterable[str], optional): only read these entries, through the index when
+            there is one. Defaults to all the entries.
+
+    Yields:
+        Tuple[str, Any]: the key and entry, or "DEFAULT" and the defaults for what follows
+    """
+    index = None
+    if keys is not None:
+        index = load_index(file_name)
+
+    with open_table(file_name, "rb") as jsonl_file:
+        if index is None:
+            for line in jsonl_file:
+                if line.strip() == b"":
+                    continue
+
+                key, value = _decode(line)
+                if keys is None or key == DEFAULT or key in keys:
+                    yield key, value
+
+            return
+
+        # random access, in file order so we only seek forward
+        defaults = index[_K_DEFAULTS]
+        offsets = sorted(index[_K_KEYS][key] for key in keys if key in index[_K_KEYS])
+        current_default = None
+        for offset in offsets:
+            default_pos = bisect_right(defaults, offset) - 1
+            if default_pos >= 0 and defaults[default_pos] != current_default:
+                current_default = defaults[default_pos]
+                jsonl_file.seek(current_default)
+                yield _decode(jsonl_file.readline())
+
+            jsonl_file.seek(offset)
+            yield _decode(jsonl_file.readline())
+
+
+def concat_jsonl(file_list: list, file_name: str):
+    """concatenates json lines tables byte for byte, the indexes are rebased rather than rebuilt
+
+    Args:
+        file_list (list): the tables to concatenate
+        file_name (str): the output table
+    """
+    index = _new_index()
+    with open(file_name, "wb") as output_file:
+        for files in file_list:
+            part_index = load_index(files)
+            if part_index is None:
+                part_index = build_index(files)
+
+            # a table starting without defaults must not inherit the ones of the previous table
+            if len(index[_K_DEFAULTS]) > 0 and 0 not in part_index[_K_DEFAULTS]:
+                index[_K_DEFAULTS].append(index[_K_SIZE])
+                index[_K_SIZE] += output_file.write(_encode(DEFAULT, OrderedDict()))
+
+            base = index[_K_SIZE]
+            index[_K_DEFAULTS] += [base + offset for offset in part_index[_K_DEFAULTS]]
+            for key, offset in part_index[_K_KEYS].items():
+                index[_K_KEYS][key] = base + offset
+
+            with open(files, "rb") as input_file:
+                while True:
+                    chunk = input_file.read(1 << 20)
+                    if len(chunk) == 0:
+                        break
+                    output_file.write(chunk)
+
+            index[_K_SIZE] = base + part_index[_K_SIZE]
+
+    with open(file_name + INDEX_EXT, "w+") as index_file:
+        dump_json(index, file=index_file)
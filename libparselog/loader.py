@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+
+"""[summary]
+loads logs and tables into keyed records, this is what the command line and the
+library interface both parse and compare with
+"""
+
+# We use OrderedDict in place of dict to
+# keep the ordering from the toml
+import os
+
+from collections import OrderedDict, deque
+
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+from typing import Any, Iterator, Tuple
+
+from libparselog.utils import iter_json, load_json, load_csv
+from libparselog.profiler import Profiler, phase
+from libparselog.rows import DefaultedRow
+from libparselog.scanner import HeaderScanner
+from libparselog.asyncload import read_text
+from libparselog.jsonl import iter_jsonl
+from libparselog.shards import is_sharded, shard_files
+from libparselog.compression import strip_compression
+from libparselog.tail import scan_tail
+from libparselog.pipeline import CommandPipeline
+
+# a single log smaller than this is parsed here rather than in a worker process
+LARGE_LOG_SIZE = 64 * 1024 * 1024
+
+
+def decompress_tbl(tbl):
+    # json are compressed using default table
+    if "DEFAULT" in tbl:
+        # once we have loaded the file, we go through and fill back the default
+        # we will delete the default, then this way we could merge two files with different defaults
+        # without issue
+        for entry in tbl:
+            if entry != "DEFAULT":
+                tbl[entry] = decompress_row(tbl[entry], tbl["DEFAULT"])
+
+        del tbl["DEFAULT"]
+    return tbl
+
+
+def decompress_row(row, default_tbl):
+    # the row reads missing headers from the shared defaults, see DefaultedRow.expand
+    if default_tbl is not None:
+        return DefaultedRow(row, default_tbl)
+
+    return row
+
+
+def table_format(file_name):
+    """the format of a table, compressed or not, ie: .json for golden.json.gz
+
+    Args:
+        file_name (str): the file
+
+    Returns:
+        str: .json, .jsonl or .csv, None for anything else
+    """
+    file_name = strip_compression(file_name)
+    for ext in (".jsonl", ".json", ".csv"):
+        if file_name.endswith(ext):
+            return ext
+
+    return None
+
+
+def is_table_file(file_name):
+    return table_format(file_name) is not None or is_sharded(file_name)
+
+
+def reads_by_key(file_name):
+    # shards and json lines tables only read the entries asked for, through their index
+    return is_sharded(file_name) or table_format(file_name) == ".jsonl"
+
+
+def read_log(driver, log_file_name):
+    """runs the preprocess hooks and reads the log, this is what the asynchronous loader
+    does ahead of the parse, tables are left for load_into_tbl to read
+
+    Args:
+        driver (ParseDriver): the driver for the parse
+        log_file_name (str): the log file to read
+
+    Returns:
+        str: the content of the log or None for tables
+    """
+    if is_table_file(log_file_name):
+        return None
+
+    log_file_name = driver.hooks.do_preprocess(log_file_name)
+    if len(driver.preprocess_commands) > 0:
+        with CommandPipeline(driver.preprocess_commands, log_file_name) as log:
+            return log.read()
+
+    return read_text(log_file_name)
+
+
+def open_log(log_file_name, content=None, command_list=None):
+    if content is not None:
+        return StringIO(content)
+
+    # the output of the preprocess commands is parsed as they write it
+    if command_list is not None and len(command_list) > 0:
+        return CommandPipeline(command_list, log_file_name)
+
+    return open(log_file_name)
+
+
+def finalize_record(driver, input_values):
+    with phase(driver.profiler, "postprocess"):
+        input_values = driver.close_series(input_values)
+
+        # load the defaults bfore post processing
+        input_values = driver.set_default(input_values)
+
+        # the hooks get a filled OrderedDict of their own, what they delete is then filled back
+        if len(driver.hooks.postprocess) > 0:
+            input_values = driver.hooks.do_postprocess(input_values.expand())
+
+        # reload the default to fill the table
+        input_values = driver.set_default(input_values)
+
+    return input_values
+
+
+def load_log(driver, log_file_name, content=None) -> Iterator[OrderedDict]:
+    """parse a log file, this is a generator yielding one record per block delimited
+    by record-start/record-end or a single record for the whole file when they are not set
+
+    Args:
+        driver (ParseDriver): the driver for the parse
+        log_file_name (str): the log file to parse
+        content (str, optional): the already preprocessed content of the log, see read_log
+
+    Yields:
+        OrderedDict: the parsed record
+    """
+    # load log file and parse
+    if content is None:
+        with phase(driver.profiler, "preprocess"):
+            log_file_name = driver.hooks.do_preprocess(log_file_name)
+
+    # without a start anchor a record opens at the top of the file and after each end anchor,
+    # these are only kept if they found something
+    implicit_start = driver.record_start is None
+    keep_empty = driver.record_end is None or not implicit_start
+
+    # the from-end headers are matched on the log read backwards, a log we can not seek into
+    # or one already in memory is read forward for all the headers
+    tail_values = None
+    if content is None and driver.can_scan_tail():
+        with phase(driver.profiler, "tail"):
+            tail_values = scan_tail(driver, log_file_name)
+
+    # setup our output dict and track the headers worth trying on each line
+    input_values = None
+    scanner = None
+    if implicit_start:
+        input_values = OrderedDict()
+        scanner = HeaderScanner(driver)
+        if tail_values is not None:
+            scanner.satisfy(driver.tail_headers)
+
+    # the tail had every header, there is nothing to read forward
+    if tail_values is not None and scanner.is_complete():
+        input_values.update(tail_values)
+        yield finalize_record(driver, input_values)
+        return
+
+    # the rolling buffer of the last lines for the headers matching over a window of lines
+    window = None
+    if driver.get_max_window() > 1:
+        window = deque(maxlen=driver.get_max_window())
+
+    with phase(driver.profiler, "parse"), open_log(
+        log_file_name, content, driver.preprocess_commands
+    ) as log:
+        for line in log:
+            # repeated lines skip the processing and the regexes
+            cached = None
+            if driver.match_cache is not None:
+                cached = driver.match_cache.lookup(line)
+                if cached is None:
+                    cached = driver.match_cache.store(line, driver.hooks.do_process(line))
+                line = cached.line
+            else:
+                line = driver.hooks.do_process(line)
+
+            if driver.is_stop_line(line):
+                break
+
+            if window is not None:
+                window.append(line)
+
+            if not implicit_start and driver.record_start.match(line) is not None:
+                if input_values is not None:
+                    yield finalize_record(driver, input_values)
+
+                input_values = OrderedDict()
+                scanner = HeaderScanner(driver)
+
+            # we are in between records
+            if input_values is None:
+                continue
+
+            if len(driver.sections) > 0:
+                scanner.update_sections(line)
+
+            if cached is None:
+                captures = scanner.match(line)
+            else:
+                captures = driver.match_cache.captures(cached, scanner.generation, scanner.match)
+
+            if window is not None and len(scanner.window_candidates) > 0:
+                captures = scanner.merge(captures, scanner.match_window(window))
+
+            # every occurrence is inserted, cached or not, so the listings stay whole
+            satisfied = []
+            for header, value in captures:
+                input_values = driver.insert_value(input_values, header, value)
+                if driver.is_first_match(header):
+                    satisfied.append(header)
+
+            if len(satisfied) > 0:
+                scanner.satisfy(satisfied)
+
+            if driver.record_end is not None and driver.record_end.match(line) is not None:
+                if keep_empty or len(input_values) > 0:
+                    yield finalize_record(driver, input_values)
+
+                input_values = None
+                if implicit_start:
+                    input_values = OrderedDict()
+                    scanner = HeaderScanner(driver)
+
+            # a complete record simply stops matching until the next one starts
+            elif driver.is_single_record() and driver.stop_when_complete and scanner.is_complete():
+                break
+
+    # the from-end headers come after the others, in the toml order
+    if tail_values is not None:
+        input_values.update(tail_values)
+
+    if input_values is not None and (keep_empty or len(input_values) > 0):
+        yield finalize_record(driver, input_values)
+
+
+def iter_entries(driver, file_name, content=None, keys=None) -> Iterator[Tuple[str, Any]]:
+    """streams the keyed records of a log or a table, records from a log are yielded
+    as they are parsed
+
+    Args:
+        driver (ParseDriver): the driver for the parse
+        file_name (str): the log or table to load
+        content (str, optional): the already preprocessed content of the log, see read_log
+        keys (Iterable[str], optional): only the entries of a table we are after
+
+    Yields:
+        Tuple[str, Any]: the key and the record, a later record replaces one with the same key
+    """
+    if is_sharded(file_name):
+        # only open the shards that can hold the keys we are after
+        for shard in shard_files(file_name, keys):
+            for key, data in iter_entries(driver, shard, keys=keys):
+                if keys is None or key in keys:
+                    yield key, data
+
+    elif table_format(file_name) == ".jsonl":
+        with phase(driver.profiler, "load_jsonl"):
+            # each DEFAULT record applies to the entries following it
+            default_tbl = None
+            for entry, values in iter_jsonl(file_name, keys):
+                if entry == "DEFAULT":
+                    default_tbl = values
+                else:
+                    yield entry, decompress_row(values, default_tbl)
+
+    elif table_format(file_name) == ".json":
+        with phase(driver.profiler, "load_json"):
+            # the defaults are written last, a first pass finds them so the rows can stream,
+            # the memory stays bound by the largest entry rather than the table
+            default_tbl = None
+            for entry, values in iter_json(file_name):
+                if entry == "DEFAULT":
+                    default_tbl = values
+                    break
+
+            for entry, values in iter_json(file_name):
+                if entry != "DEFAULT":
+                    yield entry, decompress_row(values, default_tbl)
+    else:
+        data_list = []
+        if table_format(file_name) == ".csv":
+            with phase(driver.profiler, "load_csv"):
+                data_list = load_csv(file_name)
+        else:
+            # we assume this is a log file
+            data_list = load_log(driver, file_name, content)
+
+        for data in data_list:
+            # make a key from the user desired key items
+            yield driver.generate_key(data), data
+
+
+def load_into_tbl(driver, file_name, content=None, keys=None) -> OrderedDict:
+    if not is_sharded(file_name) and table_format(file_name) == ".json":
+        # the whole table is held anyway, a single load beats streaming it twice
+        with phase(driver.profiler, "load_json"):
+            return decompress_tbl(load_json(file_name))
+
+    return OrderedDict(iter_entries(driver, file_name, content, keys))
+
+
+def _load_worker(driver, file_name):
+    # the driver is a copy in the worker, give it a fresh profiler so we only send back our share
+    if driver.profiler is not None:
+        driver.set_profiler(Profiler())
+
+    return load_into_tbl(driver, file_name), driver.profiler
+
+
+def _is_worth_a_process(file_name_list, log_list) -> bool:
+    # spawning the workers and pickling the tables back only pays off on real parsing work
+    if len(file_name_list) < 2 or len(log_list) == 0:
+        return False
+
+    if len(log_list) > 1:
+        return True
+
+    return os.path.isfile(log_list[0]) and os.path.getsize(log_list[0]) >= LARGE_LOG_SIZE
+
+
+def load_concurrently(driver, file_name_list, jobs=2) -> list:
+    """loads the inputs side by side, the logs are parsed in worker processes while the tables
+    are read here. Reading a table is mostly json.load, it holds the GIL so it stays in this
+    process, and with a single small log everything is loaded in turn
+
+    Args:
+        driver (ParseDriver): the driver for the parse
+        file_name_list (list): the inputs to load
+        jobs (int, optional): the most worker processes to start. Defaults to 2.
+
+    Returns:
+        list: the tables, in the same order as the inputs
+    """
+    log_list = [files for files in file_name_list if not is_table_file(files)]
+    if jobs < 2 or not _is_worth_a_process(file_name_list, log_list):
+        return [load_into_tbl(driver, files) for files in file_name_list]
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(log_list))) as processes:
+        futures = OrderedDict()
+        for files in log_list:
+            futures[files] = processes.submit(_load_worker, driver, files)
+
+        tbl_list = []
+        for files in file_name_list:
+            if is_table_file(files):
+                tbl_list.append(load_into_tbl(driver, files))
+                continue
+
+            tbl, profiler = futures[files].result()
+            if driver.profiler is not None:
+                driver.profiler.merge(profiler)
+
+            tbl_list.append(tbl)
+
+    return tbl_list
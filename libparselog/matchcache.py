@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+"""[summary]
+bounded LRU memoization of the header captures of a line, for logs repeating the same lines
+"""
+
+# We use OrderedDict in place of dict to
+# keep the ordering from the toml
+from collections import OrderedDict
+
+import threading
+
+
+class CachedLine:
+    """a raw line once processed, and its captures for each set of candidate headers"""
+
+    __slots__ = ("line", "captures")
+
+    def __init__(self, line):
+        self.line = line
+        self.captures = {}
+
+
+class MatchCache:
+    """maps a raw line to the line the process hooks made of it and to the (header, value)
+    captures of the headers. The captures depend on which headers were tried so they are
+    stored per generation, an id given to each distinct list of candidates.
+    The cache can be shared by the threads parsing with the same driver.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._lines = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # a worker process starts cold rather than receiving a copy of the lines
+        return {"size": self.size}
+
+    def __setstate__(self, state):
+        self.__init__(state["size"])
+
+    def generation(self, candidates: list) -> int:
+        with self._lock:
+            return self._generations.setdefault(tuple(candidates), len(self._generations))
+
+    def lookup(self, line: str) -> CachedLine:
+        """
+        Args:
+            line (str): the raw line
+
+        Returns:
+            CachedLine: the cached line or None
+        """
+        with self._lock:
+            cached = self._lines.get(line)
+            if cached is not None:
+                self._lines.move_to_end(line)
+
+        return cached
+
+    def store(self, line: str, processed_line: str) -> CachedLine:
+        cached = CachedLine(processed_line)
+        with self._lock:
+            self._lines[line] = cached
+            if len(self._lines) > self.size:
+                self._lines.popitem(last=False)
+
+        return cached
+
+    def captures(self, cached: CachedLine, generation: int, match_fn) -> list:
+        """the captures of the line for a generation, matched and stored on a miss
+
+        Args:
+            cached (CachedLine): the cached line
+            generation (int): the generation of the candidates tried on the line
+            match_fn (Callable): matches the processed line when it was not seen with these candidates
+
+        Returns:
+            list: the (header, value) captured on the line
+        """
+        captures = cached.captures.get(generation)
+        if captures is None:
+            captures = match_fn(cached.line)
+            cached.captures[generation] = captures
+            with self._lock:
+                self.misses += 1
+        else:
+            with self._lock:
+                self.hits += 1
+
+        return captures
+
+    def stats(self) -> OrderedDict:
+        stats = OrderedDict()
+        stats["size"] = self.size
+        stats["lines"] = len(self._lines)
+        stats["hits"] = self.hits
+        stats["misses"] = self.misses
+        return stats
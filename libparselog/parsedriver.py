@@ -9,16 +9,74 @@ from collections import OrderedDict
 
 import sys
 import re
+import shlex
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from json import dumps as jsonDumps
+
+from time import perf_counter
 
 from libparselog.toml import Toml
 from libparselog.hooks import Hooks
 from libparselog.comparator import Comparator
+from libparselog.rows import DefaultedRow
+from libparselog.matchcache import MatchCache
+from libparselog.fingerprint import fingerprint_row
+from libparselog.transform import compile_transform
+from libparselog.series import (
+    NumericSeries,
+    empty_series_value,
+    is_scalar_series,
+    is_valid_series,
+)
 from libparselog.utils import sanitize_value, load_fn_table, unload_list, assertion
 
 
+def _cell_key(value):
+    # tag with the type so 1, 1.0 and True stay apart, lists go through their json form
+    if isinstance(value, (list, dict)):
+        return (type(value).__name__, jsonDumps(value, sort_keys=True))
+
+    if isinstance(value, array):
+        return (type(value).__name__, jsonDumps(value.tolist()))
+
+    return (type(value).__name__, value)
+
+
+# the driver of a diff worker process, see ParseDriver.iter_diff
+_diff_driver = None
+
+
+def _init_diff_worker(driver):
+    global _diff_driver
+    _diff_driver = driver
+
+
+def _diff_chunk(diff_jobs):
+    return [_diff_driver._diff_job(job) for job in diff_jobs]
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+
+    if len(chunk) > 0:
+        yield chunk
+
+
 class ParseDriver:
     """loads a toml or a list of toml files to
     drive the log parser using the provided configurations
+
+    everything is compiled once when the driver is built and only read while parsing,
+    the state of a parse lives in the HeaderScanner of each log. A driver can so be reused
+    for any number of logs and shared by threads, the profiler and the match cache being
+    the only shared state written to, both of which lock. Set those up before sharing it.
     """
 
     _K_DFLT = "default"
@@ -28,6 +86,11 @@ class ParseDriver:
     _K_AUTO_HIDE = "auto-hide"
     _K_LIST = "listing"
     _K_COMPARE = "compare"
+    _K_FIRST_MATCH = "first-match"
+    _K_SECTION = "section"
+    _K_LINES = "lines"
+    _K_FROM_END = "from-end"
+    _K_SERIES = "series"
 
     _KEYS = [
         _K_DFLT,
@@ -37,40 +100,238 @@ class ParseDriver:
         _K_AUTO_HIDE,
         _K_LIST,
         _K_COMPARE,
+        _K_FIRST_MATCH,
+        _K_SECTION,
+        _K_LINES,
+        _K_FROM_END,
+        _K_SERIES,
     ]
 
-    hooks = Hooks()
-    comparator = Comparator()
-    conf = OrderedDict()
+    _D_STOP_REGEX = "stop-regex"
+    _D_STOP_WHEN_COMPLETE = "stop-when-complete"
+    _D_SECTIONS = "sections"
+    _D_START = "start"
+    _D_END = "end"
+    _D_RECORD_START = "record-start"
+    _D_RECORD_END = "record-end"
+    _D_INFER_DEFAULT = "infer-default"
+    _D_LINE_CACHE = "line-cache"
+    _D_FINGERPRINT = "fingerprint"
+    _D_FINGERPRINT_FILE = "fingerprint-file"
+    _D_PREPROCESS_COMMAND = "preprocess-command"
+
+    hooks = None
+    comparator = None
+    conf = None
+    regex_tbl = None
+    compared_headers = None
+    tail_headers = None
+    series_headers = None
+    fn_lists = None
+    transform = None
+    profiler = None
+    stop_when_complete = False
+    record_start = None
+    record_end = None
+    infer_default = False
+    default_tbl = None
+    match_cache = None
+    max_window = None
+    fingerprint_rows = True
+    fingerprint_file = False
+    compression_level = None
+    compression_threads = 0
 
     def __init__(
         self, toml_file_list, import_list, preprocess_list, process_list, postprocess_list
     ):
+        # the lists filled from the DRIVER entry belong to each driver
+        self.stop_regex = []
+        self.sections = OrderedDict()
+        self.preprocess_commands = []
 
         # generate the conf
-        toml_loader = Toml(toml_file_list)
-        
+        toml_loader = Toml()
+
         self.conf = toml_loader.load(toml_file_list)
 
         # unload the DRIVER entry
         driver_entries = toml_loader.unload_entry(self.conf, "DRIVER")
 
-        # load the args from the TOML and append them to the cmd line args
-        import_list += unload_list(driver_entries, "import")
-        preprocess_list += unload_list(driver_entries, "preprocess")
-        process_list += unload_list(driver_entries, "process")
-        postprocess_list += unload_list(driver_entries, "postprocess")
+        # and the line transforms, they run ahead of the process hooks
+        self.transform = compile_transform(toml_loader.unload_entry(self.conf, "TRANSFORM"))
+
+        # load the args from the TOML and append them to the cmd line args,
+        # without modifying the lists we were given so they can build other drivers
+        import_list = list(import_list) + unload_list(driver_entries, "import")
+        preprocess_list = list(preprocess_list) + unload_list(driver_entries, "preprocess")
+        process_list = list(process_list) + unload_list(driver_entries, "process")
+        postprocess_list = list(postprocess_list) + unload_list(driver_entries, "postprocess")
+
+        # kept to load the functions again in a worker process, see __setstate__
+        self.fn_lists = (import_list, preprocess_list, process_list, postprocess_list)
+        self._init_functions()
+
+        # what is left in the DRIVER entry drives the parsing itself
+        self._init_driver(driver_entries)
+
+        # finalize the toml now that we stripped entries that are for the driver
+        self._init_entries()
+        self._sanitize()
+        self._compile()
+
+    def _init_functions(self):
+        import_list, preprocess_list, process_list, postprocess_list = self.fn_lists
 
         # load the functions from the imports into a table
         function_table = load_fn_table(import_list)
 
         # initialize our hooks and comparators using the function table
         self.hooks = Hooks(function_table, preprocess_list, process_list, postprocess_list)
+        self.hooks.transform = self.transform
         self.comparator = Comparator(function_table)
 
-        # finalize the toml now that we stripped entries that are for the driver
-        self._init_entries()
-        self._sanitize()
+    def __getstate__(self):
+        # the imported functions can not always be pickled, the worker imports them again
+        state = self.__dict__.copy()
+        if self.fn_lists is not None:
+            del state["hooks"]
+            del state["comparator"]
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.fn_lists is not None:
+            self._init_functions()
+            self.hooks.profiler = self.profiler
+
+    def _init_driver(self, driver_entries):
+        self.stop_regex = [
+            re.compile(regexes) for regexes in unload_list(driver_entries, self._D_STOP_REGEX)
+        ]
+
+        self.stop_when_complete = False
+        if self._D_STOP_WHEN_COMPLETE in driver_entries:
+            assertion(
+                isinstance(driver_entries[self._D_STOP_WHEN_COMPLETE], bool),
+                self._D_STOP_WHEN_COMPLETE + " in toml[DRIVER] is expected to be a bool",
+            )
+            self.stop_when_complete = driver_entries[self._D_STOP_WHEN_COMPLETE]
+            del driver_entries[self._D_STOP_WHEN_COMPLETE]
+
+        # sections are declared as { name: { start: regex, end: regex } }
+        self.sections = OrderedDict()
+        if self._D_SECTIONS in driver_entries:
+            assertion(
+                isinstance(driver_entries[self._D_SECTIONS], dict),
+                self._D_SECTIONS + " in toml[DRIVER] must be of format '{ name: { start: regex, end: regex } }'",
+            )
+            for section, anchors in driver_entries[self._D_SECTIONS].items():
+                assertion(
+                    isinstance(anchors, dict) and isinstance(anchors.get(self._D_START), str),
+                    self._D_START + " in toml[DRIVER][" + section + "] is required and must be a string",
+                )
+                end_re = None
+                if anchors.get(self._D_END) is not None:
+                    end_re = re.compile(anchors[self._D_END])
+
+                self.sections[section] = (re.compile(anchors[self._D_START]), end_re)
+
+            del driver_entries[self._D_SECTIONS]
+
+        # records split a single log into many keyed entries
+        self.record_start = self._unload_regex(driver_entries, self._D_RECORD_START)
+        self.record_end = self._unload_regex(driver_entries, self._D_RECORD_END)
+
+        # pick the DEFAULT table from the data rather than hide-if when compressing
+        self.infer_default = False
+        if self._D_INFER_DEFAULT in driver_entries:
+            assertion(
+                isinstance(driver_entries[self._D_INFER_DEFAULT], bool),
+                self._D_INFER_DEFAULT + " in toml[DRIVER] is expected to be a bool",
+            )
+            self.infer_default = driver_entries[self._D_INFER_DEFAULT]
+            del driver_entries[self._D_INFER_DEFAULT]
+
+        # memoize the captures of up to that many distinct lines
+        self.match_cache = None
+        if driver_entries.get(self._D_LINE_CACHE) is not None:
+            assertion(
+                isinstance(driver_entries[self._D_LINE_CACHE], int),
+                self._D_LINE_CACHE + " in toml[DRIVER] is expected to be the number of lines to cache",
+            )
+            self.set_match_cache(driver_entries[self._D_LINE_CACHE])
+            del driver_entries[self._D_LINE_CACHE]
+
+        # identical rows are Ok without calling the comparators, turn it off for comparators
+        # that can refuse identical values
+        self.fingerprint_rows = True
+        if self._D_FINGERPRINT in driver_entries:
+            assertion(
+                isinstance(driver_entries[self._D_FINGERPRINT], bool),
+                self._D_FINGERPRINT + " in toml[DRIVER] is expected to be a bool",
+            )
+            self.fingerprint_rows = driver_entries[self._D_FINGERPRINT]
+            del driver_entries[self._D_FINGERPRINT]
+
+        # keep the fingerprints of the tables we write in a sidecar file
+        self.fingerprint_file = False
+        if self._D_FINGERPRINT_FILE in driver_entries:
+            assertion(
+                isinstance(driver_entries[self._D_FINGERPRINT_FILE], bool),
+                self._D_FINGERPRINT_FILE + " in toml[DRIVER] is expected to be a bool",
+            )
+            self.fingerprint_file = driver_entries[self._D_FINGERPRINT_FILE]
+            del driver_entries[self._D_FINGERPRINT_FILE]
+
+        # external commands piped one into the next after the preprocess hooks,
+        # as a command line string or as the list of its arguments
+        self.preprocess_commands = []
+        for command in unload_list(driver_entries, self._D_PREPROCESS_COMMAND):
+            if isinstance(command, str):
+                command = shlex.split(command)
+
+            assertion(
+                isinstance(command, list)
+                and len(command) > 0
+                and all([isinstance(argument, str) for argument in command]),
+                self._D_PREPROCESS_COMMAND + " in toml[DRIVER] is expected to be a list of commands",
+            )
+            self.preprocess_commands.append(command)
+
+    def _compile(self):
+        # build what is otherwise built lazily, nothing is written to while parsing
+        self.regex_tbl = OrderedDict(
+            [
+                (header, [re.compile(regexes) for regexes in self.conf[header][self._K_REGEX]])
+                for header in self.conf
+            ]
+        )
+        self.compared_headers = [
+            header for header in self.conf if self.conf[header][self._K_COMPARE] is not None
+        ]
+        self.tail_headers = [header for header in self.conf if self.conf[header][self._K_FROM_END]]
+        self.series_headers = [
+            header for header in self.conf if self.conf[header][self._K_SERIES] is not None
+        ]
+        self.get_default_tbl()
+        self.get_max_window()
+
+    def _unload_regex(self, driver_entries, entry):
+        if driver_entries.get(entry) is None:
+            return None
+
+        assertion(
+            isinstance(driver_entries[entry], str),
+            entry + " in toml[DRIVER] is expected to be a string",
+        )
+        regex = re.compile(driver_entries[entry])
+        del driver_entries[entry]
+        return regex
+
+    def _assert_type(self, entry, key, type_list):
+        Toml().assert_type(self.conf, entry, key, type_list)
 
     def _init_entries(self):
         for entry in self.conf:
@@ -90,14 +351,23 @@ class ParseDriver:
                     self.conf[entry][key] = None
 
             # some types have built in defaults
-            if self.conf[entry][self._Kself._KEY] is None:
-                self.conf[entry][self._Kself._KEY] = False
+            if self.conf[entry][self._K_KEY] is None:
+                self.conf[entry][self._K_KEY] = False
 
             if self.conf[entry][self._K_LIST] is None:
                 self.conf[entry][self._K_LIST] = False
 
+            if self.conf[entry][self._K_FIRST_MATCH] is None:
+                self.conf[entry][self._K_FIRST_MATCH] = False
+
+            if self.conf[entry][self._K_LINES] is None:
+                self.conf[entry][self._K_LINES] = 1
+
+            if self.conf[entry][self._K_FROM_END] is None:
+                self.conf[entry][self._K_FROM_END] = False
+
             # if the type is a key, remove the defaults
-            if self.conf[entry][self._Kself._KEY]:
+            if self.conf[entry][self._K_KEY]:
                 self.conf[entry][self._K_DFLT] = None
                 self.conf[entry][self._K_AUTO_HIDE] = False
                 self.conf[entry][self._K_HIDE_IF] = None
@@ -113,13 +383,13 @@ class ParseDriver:
         # this will be used to make sure we have a key for the table
         keyed = False
 
-        for entry in self:
+        for entry in self.conf:
 
             assertion(
                 self._K_REGEX in self.conf[entry],
                 self._K_REGEX + " in toml[" + entry + "] is required for the configuration to work",
             )
-            self.Toml.assert_type(self, entry, self._K_REGEX, (str, list))
+            self._assert_type(entry, self._K_REGEX, (str, list))
 
             if isinstance(self.conf[entry][self._K_REGEX], str):
                 # regexes are always arrays, so we just fix that here
@@ -131,16 +401,60 @@ class ParseDriver:
                         self._K_REGEX + " in toml[" + entry + "] is expected to be a list of string",
                     )
 
-            Toml.assert_type(self, entry, self._K_AUTO_HIDE, (bool))
-            Toml.assert_type(self, entry, self._K_LIST, (bool))
-            Toml.assert_type(self, entry, self._Kself._KEY, (bool))
+            self._assert_type(entry, self._K_AUTO_HIDE, (bool))
+            self._assert_type(entry, self._K_LIST, (bool))
+            self._assert_type(entry, self._K_FIRST_MATCH, (bool))
+            self._assert_type(entry, self._K_LINES, (int))
+            assertion(
+                self.conf[entry][self._K_LINES] >= 1,
+                self._K_LINES + " in toml[" + entry + "] is expected to be at least 1",
+            )
+
+            # the log is read backwards for these, so nothing depending on what came before
+            self._assert_type(entry, self._K_FROM_END, (bool))
+            if self.conf[entry][self._K_FROM_END]:
+                assertion(
+                    not self.conf[entry][self._K_FIRST_MATCH]
+                    and self.conf[entry][self._K_SECTION] is None
+                    and self.conf[entry][self._K_LINES] == 1,
+                    self._K_FROM_END + " in toml[" + entry + "] can not be used along with "
+                    + self._K_FIRST_MATCH + ", " + self._K_SECTION + " or " + self._K_LINES,
+                )
+
+            # a series is a listing of numbers held in an array or reduced as it is parsed
+            if self.conf[entry][self._K_SERIES] is not None:
+                assertion(
+                    is_valid_series(self.conf[entry][self._K_SERIES]),
+                    self._K_SERIES + " in toml[" + entry + "] is expected to be one of "
+                    + "array, count, sum, min, max, { last = N } or { downsample = N }",
+                )
+                assertion(
+                    not self.conf[entry][self._K_KEY]
+                    and not self.conf[entry][self._K_FIRST_MATCH],
+                    self._K_SERIES + " in toml[" + entry + "] can not be used along with "
+                    + self._K_KEY + " or " + self._K_FIRST_MATCH,
+                )
+                self.conf[entry][self._K_LIST] = True
+
+            if self.conf[entry][self._K_SECTION] is not None:
+                assertion(
+                    self.conf[entry][self._K_SECTION] in self.sections,
+                    self._K_SECTION + " in toml[" + entry + "] is not declared in toml[DRIVER][" + self._D_SECTIONS + "]",
+                )
+            self._assert_type(entry, self._K_KEY, (bool))
 
             if self.conf[entry][self._K_DFLT] is not None and isinstance(
                 self.conf[entry][self._K_DFLT], list
             ):
                 self.conf[entry][self._K_LIST] = True
 
-            if self.conf[entry][self._K_LIST]:
+            # a series reduced to a number has no list to default to, but a count of nothing is 0
+            if self.conf[entry][self._K_DFLT] is None:
+                self.conf[entry][self._K_DFLT] = empty_series_value(self.conf[entry][self._K_SERIES])
+
+            if self.conf[entry][self._K_LIST] and not is_scalar_series(
+                self.conf[entry][self._K_SERIES]
+            ):
                 if self.conf[entry][self._K_DFLT] is None:
                     self.conf[entry][self._K_DFLT] = []
                 elif not isinstance(self.conf[entry][self._K_DFLT], list):
@@ -152,15 +466,23 @@ class ParseDriver:
                 ):
                     self.conf[entry][self._K_HIDE_IF] = [self.conf[entry][self._K_HIDE_IF]]
 
+            # a listing needs every line, reading it backwards only reads the log twice
+            if self.conf[entry][self._K_FROM_END]:
+                assertion(
+                    not self.conf[entry][self._K_LIST],
+                    self._K_FROM_END + " in toml[" + entry + "] can not be used along with "
+                    + self._K_LIST + " or " + self._K_SERIES,
+                )
+
             # if we have a comparison, make sur it contains a struct we can hand off
             if self.conf[entry][self._K_COMPARE] is not None:
-                Toml.assert_type(self, entry, self._K_COMPARE, (dict))
+                self._assert_type(entry, self._K_COMPARE, (dict))
                 assertion(
-                    len(self.conf[entry][self._K_COMPARE].self._KEYS()) == 1,
+                    len(self.conf[entry][self._K_COMPARE].keys()) == 1,
                     self._K_COMPARE + " in toml[" + entry + "] must be of format 'function: struct', with only one function",
                 )
 
-            if self.conf[entry][self._Kself._KEY]:
+            if self.conf[entry][self._K_KEY]:
                 keyed = True
 
         if not keyed:
@@ -170,9 +492,31 @@ class ParseDriver:
             )
             sys.exit(255)
 
+    def set_profiler(self, profiler):
+        """attach a profiler to the driver and its hooks, None detaches it
+
+        Args:
+            profiler (Profiler): the profiler collecting the timings
+        """
+        self.profiler = profiler
+        self.hooks.profiler = profiler
+
+    def set_match_cache(self, size):
+        """cache the captures of the last size distinct lines, 0 disables it
+
+        Args:
+            size (int): the number of lines to remember
+        """
+        self.match_cache = None
+        if size > 0:
+            self.match_cache = MatchCache(size)
+
     def insert_value(self, tbl, header, value):
         if header not in tbl and self.conf[header][self._K_LIST]:
-            tbl[header] = []
+            if self.conf[header][self._K_SERIES] is not None:
+                tbl[header] = NumericSeries(header, self.conf[header][self._K_SERIES])
+            else:
+                tbl[header] = []
 
         # append all the finds to the list
         if self.conf[header][self._K_LIST]:
@@ -183,16 +527,74 @@ class ParseDriver:
 
         return tbl
 
-    def set_default(self, tbl):
-        for header in self.get_header_list():
-            if header not in tbl:
-                tbl[header] = self.conf[header][self._K_DFLT]
+    def close_series(self, tbl):
+        # the record holds what the series accumulated, not the series itself
+        for header in self.series_headers:
+            if header in tbl and isinstance(tbl[header], NumericSeries):
+                tbl[header] = tbl[header].result()
 
         return tbl
 
+    def set_default(self, tbl):
+        # the defaults are read through on access rather than copied in every record
+        if isinstance(tbl, DefaultedRow) and tbl.defaults is self.get_default_tbl():
+            return tbl
+
+        return DefaultedRow(tbl, self.get_default_tbl(), fill_none=False)
+
+    def get_default_tbl(self) -> OrderedDict:
+        if self.default_tbl is None:
+            self.default_tbl = OrderedDict(
+                [(header, self.conf[header][self._K_DFLT]) for header in self.get_header_list()]
+            )
+
+        return self.default_tbl
+
+    def is_key(self, header):
+        return self.conf[header][self._K_KEY]
+
     def is_multivalued(self, header):
         return self.conf[header][self._K_LIST]
 
+    def is_scalar_series(self, header):
+        # a series reduced to a single number rather than a listing
+        return is_scalar_series(self.conf[header][self._K_SERIES])
+
+    def is_first_match(self, header):
+        return self.conf[header][self._K_FIRST_MATCH]
+
+    def get_window(self, header):
+        return self.conf[header][self._K_LINES]
+
+    def get_max_window(self) -> int:
+        """the number of lines load_log has to keep for the windowed headers"""
+        if self.max_window is None:
+            self.max_window = max([1] + [self.get_window(header) for header in self.conf])
+
+        return self.max_window
+
+    def is_single_record(self):
+        return self.record_start is None and self.record_end is None
+
+    def can_scan_tail(self):
+        # records and stop lines depend on reading forward, and a pipe can only be read forward
+        return (
+            len(self.tail_headers) > 0
+            and self.is_single_record()
+            and len(self.stop_regex) == 0
+            and len(self.preprocess_commands) == 0
+        )
+
+    def get_section(self, header):
+        return self.conf[header][self._K_SECTION]
+
+    def is_stop_line(self, line):
+        for regexes in self.stop_regex:
+            if regexes.match(line) is not None:
+                return True
+
+        return False
+
     def generate_tbl(self, key: str) -> OrderedDict:
         """will generate an empty table for the key, with the default value
 
@@ -205,7 +607,7 @@ class ParseDriver:
         # set the grab the values for that key
         input_values = OrderedDict()
         for header in self.conf:
-            if not self.conf[header][self._Kself._KEY]:
+            if not self.conf[header][self._K_KEY]:
                 input_values[header] = self.conf[header][key]
 
         return input_values
@@ -215,11 +617,13 @@ class ParseDriver:
         return self.generate_tbl(self._K_HIDE_IF)
 
     def regex_line(self, header, line):
-        # compile the regex entries
+        if self.profiler is not None:
+            return self._profiled_regex_line(header, line)
+
         entry_list = []
 
-        for regexes in self.conf[header][self._K_REGEX]:
-            matched_re = re.match(regexes, line)
+        for regexes in self.regex_tbl[header]:
+            matched_re = regexes.match(line)
             if matched_re is not None:
                 for entry in matched_re.groups():
                     if entry is not None:
@@ -233,13 +637,30 @@ class ParseDriver:
         # sanitize whitespace
         return sanitize_value(entry_str)
 
+    def _profiled_regex_line(self, header, line):
+        entry_list = []
+
+        for regexes in self.regex_tbl[header]:
+            start = perf_counter()
+            matched_re = regexes.match(line)
+            self.profiler.add_regex(
+                header, regexes.pattern, matched_re is not None, perf_counter() - start
+            )
+            if matched_re is not None:
+                for entry in matched_re.groups():
+                    if entry is not None:
+                        entry_list.append(entry)
+
+        # the sanitize is timed along with the rest of the parse phase
+        return sanitize_value(" ".join(entry_list))
+
     def get_header_list(self):
         return self.conf.keys()
 
     def generate_key(self, dataset):
         keyed = []
         for header in self.conf:
-            if self.conf[header][self._Kself._KEY]:
+            if self.conf[header][self._K_KEY]:
                 value = None
                 if header in dataset and dataset[header] is not None:
                     value = dataset[header]
@@ -267,46 +688,163 @@ class ParseDriver:
 
         return dataset
 
+    def infer_hidden_tbl(self, tbl) -> OrderedDict:
+        """picks the most frequent value of each column as its default, a column holding
+        None or missing from an entry keeps None since decompressing would fill those back
+
+        Args:
+            tbl (OrderedDict): the table to compress
+
+        Returns:
+            OrderedDict: the table of defaults
+        """
+        hidden_tbl = self.generate_hidden_tbl()
+        for header in hidden_tbl:
+            counts = {}
+            values = {}
+            for entry in tbl:
+                if header not in tbl[entry] or tbl[entry][header] is None:
+                    counts = {}
+                    break
+
+                cell = _cell_key(tbl[entry][header])
+                if cell not in counts:
+                    counts[cell] = 0
+                    values[cell] = tbl[entry][header]
+                counts[cell] += 1
+
+            hidden_tbl[header] = None
+            if len(counts) > 0:
+                hidden_tbl[header] = values[max(counts, key=counts.get)]
+
+        return hidden_tbl
+
+    def hide_values(self, dataset, hidden_tbl):
+        for header in hidden_tbl:
+            if (
+                hidden_tbl[header] is not None
+                and header in dataset
+                and _cell_key(dataset[header]) == _cell_key(hidden_tbl[header])
+            ):
+                del dataset[header]
+
+        return dataset
+
+    def fingerprint(self, row) -> str:
+        return fingerprint_row(self.get_header_list(), row)
+
+    def diff_entry(self, expected_row=None, got_row=None, identical=False) -> OrderedDict:
+        """compares a single entry, header by header
+
+        Args:
+            expected_row (Mapping, optional): the golden row, None when the entry is new
+            got_row (Mapping, optional): the resulting row, None when the entry is missing
+            identical (bool, optional): the rows have the same fingerprint, every header is Ok
+                without going through the comparators
+
+        Returns:
+            OrderedDict: the __STATUS__ of the entry and the __ENTRIES__ of each header
+        """
+        diff = OrderedDict()
+        diff["__STATUS__"] = "Ok"
+        diff["__ENTRIES__"] = OrderedDict()
+
+        for header in self.get_header_list():
+            diff["__ENTRIES__"][header] = OrderedDict()
+            diff["__ENTRIES__"][header]["__GOT__"] = None
+            diff["__ENTRIES__"][header]["__EXPECTED__"] = None
+            diff["__ENTRIES__"][header]["__STATUS__"] = "Ok"
+
+            if expected_row is None:
+                diff["__STATUS__"] = "New"
+                diff["__ENTRIES__"][header]["__STATUS__"] = "New"
+            elif header in expected_row:
+                diff["__ENTRIES__"][header]["__EXPECTED__"] = expected_row[header]
+
+            if got_row is None:
+                diff["__STATUS__"] = "Missing"
+                diff["__ENTRIES__"][header]["__STATUS__"] = "Missing"
+            elif header in got_row:
+                diff["__ENTRIES__"][header]["__GOT__"] = got_row[header]
+
+            if not identical and not self.compare(
+                header,
+                diff["__ENTRIES__"][header]["__EXPECTED__"],
+                diff["__ENTRIES__"][header]["__GOT__"],
+            ):
+                diff["__STATUS__"] = "Failed"
+                diff["__ENTRIES__"][header]["__STATUS__"] = "Failed"
+
+        return diff
+
+    def _iter_diff_jobs(self, expected, got, fingerprints=None):
+        # the golden entries first in their order followed by the new ones
+        for entry in expected:
+            expected_fingerprint = None
+            if fingerprints is not None:
+                expected_fingerprint = fingerprints.get(entry)
+
+            yield entry, expected[entry], got[entry] if entry in got else None, expected_fingerprint
+
+        for entry in got:
+            if entry not in expected:
+                yield entry, None, got[entry], None
+
+    def _diff_job(self, job):
+        entry, expected_row, got_row, expected_fingerprint = job
+
+        # without comparators every header is Ok already, there is nothing to skip
+        identical = False
+        if (
+            expected_row is not None
+            and got_row is not None
+            and self.fingerprint_rows
+            and len(self.compared_headers) > 0
+        ):
+            if expected_fingerprint is None:
+                expected_fingerprint = self.fingerprint(expected_row)
+
+            identical = expected_fingerprint == self.fingerprint(got_row)
+
+        return entry, self.diff_entry(expected_row, got_row, identical)
+
+    def iter_diff(self, expected, got, fingerprints=None, jobs=0, chunk_size=256):
+        """streams the diff of two tables, the golden entries come first in their order
+        followed by the new ones in the order of the result
+
+        Args:
+            expected (Mapping): the golden table
+            got (Mapping): the resulting table
+            fingerprints (Mapping, optional): the fingerprints of the golden entries, from its
+                sidecar, the ones not found are computed
+            jobs (int, optional): compare in that many worker processes, for comparators doing
+                real work. The entries come back in the same order either way. Defaults to 0.
+            chunk_size (int, optional): the number of entries handed to a worker at once
+
+        Yields:
+            Tuple[str, OrderedDict]: the entry and its diff, see diff_entry
+        """
+        diff_jobs = self._iter_diff_jobs(expected, got, fingerprints)
+        if jobs <= 1:
+            for job in diff_jobs:
+                yield self._diff_job(job)
+            return
+
+        # the driver is sent once to each worker rather than with every chunk
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_diff_worker, initargs=(self,)
+        ) as processes:
+            for diff_chunk in processes.map(_diff_chunk, _chunked(diff_jobs, chunk_size)):
+                yield from diff_chunk
+
     def do_diff(
         self,
         expected,
         got,
+        fingerprints=None,
+        jobs=0,
     ):
-        diff = OrderedDict()
-
-        # generate the diff table
-        for entry in set(list(expected.keys()) + list(got.keys())):
-            diff[entry] = OrderedDict()
-            diff[entry]["__STATUS__"] = "Ok"
-            diff[entry]["__ENTRIES__"] = OrderedDict()
-
-            for header in self.get_header_list():
-                diff[entry]["__ENTRIES__"][header] = OrderedDict()
-                diff[entry]["__ENTRIES__"][header]["__GOT__"] = None
-                diff[entry]["__ENTRIES__"][header]["__EXPECTED__"] = None
-                diff[entry]["__ENTRIES__"][header]["__STATUS__"] = "Ok"
-
-                if entry not in expected:
-                    diff[entry]["__STATUS__"] = "New"
-                    diff[entry]["__ENTRIES__"][header]["__STATUS__"] = "New"
-                elif header in expected[entry]:
-                    diff[entry]["__ENTRIES__"][header]["__EXPECTED__"] = expected[entry][header]
-
-                if entry not in got:
-                    diff[entry]["__STATUS__"] = "Missing"
-                    diff[entry]["__ENTRIES__"][header]["__STATUS__"] = "Missing"
-                elif entry in got and header in got[entry]:
-                    diff[entry]["__ENTRIES__"][header]["__GOT__"] = got[entry][header]
-
-                if not self.compare(
-                    header,
-                    diff[entry]["__ENTRIES__"][header]["__EXPECTED__"],
-                    diff[entry]["__ENTRIES__"][header]["__GOT__"],
-                ):
-                    diff[entry]["__STATUS__"] = "Failed"
-                    diff[entry]["__ENTRIES__"][header]["__STATUS__"] = "Failed"
-
-        return diff
+        return OrderedDict(self.iter_diff(expected, got, fingerprints, jobs))
 
     def compare(self, header, expected, got):
         if self.conf[header][self._K_COMPARE] is None:
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+"""[summary]
+the preprocess stages that are external commands, ie: c++filt, chained with pipes
+so they run alongside the parse and their output is read as it comes without temporary files
+"""
+
+import io
+import subprocess
+import sys
+
+from typing import Iterator, List
+
+
+class CommandPipeline:
+    """the commands piped one into the next, the first reading the log. Iterating over it
+    gives the lines the last one writes out, as iterating over the log would.
+    """
+
+    def __init__(self, command_list: List[List[str]], log_file_name: str):
+        """
+        Args:
+            command_list (List[List[str]]): the arguments of each command, in order
+            log_file_name (str): the log fed to the first command
+        """
+        self.command_list = command_list
+        self.log_file_name = log_file_name
+        self.processes = []
+        self.output = None
+        self.done = False
+
+    def __enter__(self):
+        stdin = open(self.log_file_name, "rb")
+        for command in self.command_list:
+            try:
+                process = subprocess.Popen(command, stdin=stdin, stdout=subprocess.PIPE)
+            except OSError as error:
+                print(
+                    "ERROR: unable to run the preprocess command "
+                    + " ".join(command)
+                    + ": "
+                    + str(error)
+                )
+                stdin.close()
+                self._stop()
+                sys.exit(255)
+
+            # the child has its own copy, ours would keep the pipe open once it exits
+            stdin.close()
+            stdin = process.stdout
+            self.processes.append(process)
+
+        self.output = io.TextIOWrapper(stdin)
+        return self
+
+    def __iter__(self) -> Iterator[str]:
+        for line in self.output:
+            yield line
+
+        self.done = True
+
+    def read(self) -> str:
+        content = self.output.read()
+        self.done = True
+        return content
+
+    def _stop(self):
+        for process in self.processes:
+            if process.poll() is None:
+                process.kill()
+
+            process.wait()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.output.close()
+
+        # the parse stopped before the end, the commands are not needed anymore
+        if not self.done:
+            self._stop()
+            return False
+
+        for command, process in zip(self.command_list, self.processes):
+            if process.wait() != 0:
+                print(
+                    "ERROR: the preprocess command "
+                    + " ".join(command)
+                    + " exited with "
+                    + str(process.returncode)
+                    + " on "
+                    + self.log_file_name
+                )
+                sys.exit(255)
+
+        return False
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+"""[summary]
+collects timing information for the parser, it is only ever called into when one
+is attached to the driver, so parsing without it does not pay for the bookkeeping
+"""
+
+# We use OrderedDict in place of dict to
+# keep the ordering from the toml
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from time import perf_counter, process_time
+
+import sys
+import threading
+
+from libparselog.utils import dump_json
+
+_NO_PHASE = nullcontext()
+
+
+def phase(profiler, name: str):
+    """context manager timing the phase if a profiler is attached
+
+    Args:
+        profiler (Profiler): the profiler to report to, or None when profiling is off
+        name (str): the name of the phase
+
+    Returns:
+        the context manager to wrap the phase with
+    """
+    if profiler is None:
+        return _NO_PHASE
+
+    return profiler.phase(name)
+
+
+class Profiler:
+    """accumulates wall and cpu time per phase, call count and time per hook
+    and attempts, hits and time per header regex. It can be shared by the threads
+    parsing with the same driver.
+    """
+
+    def __init__(self):
+        self.phases = OrderedDict()
+        self.hooks = OrderedDict()
+        self.headers = OrderedDict()
+        self.counters = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        # the lock stays behind when sent to or back from a worker process
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def phase(self, name: str):
+        """times the wrapped block as one call of the phase
+
+        Args:
+            name (str): the name of the phase
+        """
+        wall_start = perf_counter()
+        cpu_start = process_time()
+        try:
+            yield self
+        finally:
+            self.add_phase(name, perf_counter() - wall_start, process_time() - cpu_start)
+
+    def add_phase(self, name: str, wall: float, cpu: float = 0.0):
+        with self._lock:
+            if name not in self.phases:
+                self.phases[name] = OrderedDict([("calls", 0), ("wall", 0.0), ("cpu", 0.0)])
+
+            self.phases[name]["calls"] += 1
+            self.phases[name]["wall"] += wall
+            self.phases[name]["cpu"] += cpu
+
+    def add_hook(self, kind: str, name: str, wall: float):
+        with self._lock:
+            if kind not in self.hooks:
+                self.hooks[kind] = OrderedDict()
+
+            if name not in self.hooks[kind]:
+                self.hooks[kind][name] = OrderedDict([("calls", 0), ("wall", 0.0)])
+
+            self.hooks[kind][name]["calls"] += 1
+            self.hooks[kind][name]["wall"] += wall
+
+    def add_regex(self, header: str, regex: str, hit: bool, wall: float):
+        with self._lock:
+            if header not in self.headers:
+                self.headers[header] = OrderedDict(
+                    [("attempts", 0), ("hits", 0), ("wall", 0.0), ("regex", OrderedDict())]
+                )
+
+            stats = self.headers[header]
+            if regex not in stats["regex"]:
+                stats["regex"][regex] = OrderedDict([("attempts", 0), ("hits", 0), ("wall", 0.0)])
+
+            for counters in (stats, stats["regex"][regex]):
+                counters["attempts"] += 1
+                counters["hits"] += int(hit)
+                counters["wall"] += wall
+
+    def set_counters(self, name: str, counters: OrderedDict):
+        """report statistics kept elsewhere, ie: the match cache hits and misses"""
+        with self._lock:
+            self.counters[name] = counters
+
+    def merge(self, other):
+        """folds the statistics of another profiler, ie: one that ran in a worker process
+
+        Args:
+            other (Profiler): the profiler to merge in this one
+        """
+        with self._lock:
+            self._merge(other)
+
+    def _merge(self, other):
+        for name, stats in other.phases.items():
+            self.add_phase(name, stats["wall"], stats["cpu"])
+            self.phases[name]["calls"] += stats["calls"] - 1
+
+        for kind, hook_stats in other.hooks.items():
+            for name, stats in hook_stats.items():
+                self.add_hook(kind, name, stats["wall"])
+                self.hooks[kind][name]["calls"] += stats["calls"] - 1
+
+        for header, header_stats in other.headers.items():
+            for regex, stats in header_stats["regex"].items():
+                self.add_regex(header, regex, False, stats["wall"])
+                for counters in (self.headers[header], self.headers[header]["regex"][regex]):
+                    counters["attempts"] += stats["attempts"] - 1
+                    counters["hits"] += stats["hits"]
+
+        for name, counters in other.counters.items():
+            if name not in self.counters:
+                self.counters[name] = OrderedDict()
+
+            for counter, value in counters.items():
+                if isinstance(value, (int, float)) and counter in self.counters[name]:
+                    self.counters[name][counter] += value
+                else:
+                    self.counters[name][counter] = value
+
+    def report(self) -> OrderedDict:
+        """builds the machine readable report
+
+        Returns:
+            OrderedDict: the phases, hooks and headers statistics
+        """
+        report = OrderedDict()
+        report["phases"] = self.phases
+        report["hooks"] = self.hooks
+        report["headers"] = self.headers
+        report["counters"] = self.counters
+        return report
+
+    def dump(self, file=sys.stderr):
+        dump_json(self.report(), file=file)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+
+"""[summary]
+reports the outcome of a comparison, the diff loop hands each entry to a reporter
+which decides what gets written and when
+"""
+
+# We use OrderedDict in place of dict to
+# keep the ordering from the toml
+from collections import OrderedDict
+from array import array
+from json import dumps as jsonDumps
+from tempfile import TemporaryFile
+from xml.sax.saxutils import escape, quoteattr
+
+import sys
+
+from libparselog.utils import colored, json_default
+
+_LEN = 38
+
+STATUS_COLORS = {
+    "Ok": "green",
+    "Failed": "red",
+    "New": "orange",
+    "Missing": "orange",
+}
+
+
+def satus_line(status, color, colorize):
+    output = (
+        colored("  " + status + " ", color, colorize)
+        + ". . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . ."
+    )
+    return output[:_LEN] + " "
+
+
+def _printable(value):
+    # a numeric series reads as the list it is written as in the tables
+    if isinstance(value, array):
+        return json_default(value)
+
+    return value
+
+
+def mismatch_str(colorize, header, expected=None, got=None):
+    header = "{0:<{1}}".format("- " + header, _LEN)
+    if expected is None:
+        expected = ""
+    else:
+        expected = colored("[-" + str(_printable(expected)) + "-]", "red", colorize)
+
+    if got is None:
+        got = ""
+    else:
+        got = colored("{+" + str(_printable(got)) + "+}", "green", colorize)
+
+    return "    " + header + expected + got
+
+
+def mismatches(status: str, entries: OrderedDict) -> list:
+    """the (header, expected, got) worth reporting for an entry
+
+    Args:
+        status (str): the status of the entry
+        entries (OrderedDict): the headers of the entry from ParseDriver.do_diff
+
+    Returns:
+        list: the (header, expected, got) tuples, expected or got is None when it does not apply
+    """
+    mismatch_list = []
+    for header in entries:
+        if status == "Missing":
+            mismatch_list.append((header, entries[header]["__EXPECTED__"], None))
+        elif status == "New":
+            mismatch_list.append((header, None, entries[header]["__GOT__"]))
+        elif status == "Failed" and entries[header]["__STATUS__"] != "Ok":
+            mismatch_list.append(
+                (header, entries[header]["__EXPECTED__"], entries[header]["__GOT__"])
+            )
+
+    return mismatch_list
+
+
+class Reporter:
+    """receives the status of every entry of a comparison, the base reporter drops everything"""
+
+    def report(self, entry: str, status: str, entries: OrderedDict):
+        """
+        Args:
+            entry (str): the key of the entry
+            status (str): Ok, Failed, New or Missing
+            entries (OrderedDict): the headers of the entry from ParseDriver.do_diff
+        """
+
+    def close(self):
+        """flush what is left once the comparison is done"""
+
+
+class TextReporter(Reporter):
+    """the human readable report, lines are buffered and written in blocks"""
+
+    def __init__(
+        self, colorize=True, failures_only=False, file=sys.stdout, err=sys.stderr, buffer_lines=4096
+    ):
+        self.colorize = colorize
+        self.failures_only = failures_only
+        self.file = file
+        self.err = err
+        self.buffer_lines = buffer_lines
+        self._lines = []
+        self._names = []
+
+    def report(self, entry, status, entries):
+        if status == "Ok":
+            if self.failures_only:
+                return
+        else:
+            # the failed test names go to std error
+            self._names.append(entry)
+
+        self._lines.append(satus_line(status, STATUS_COLORS.get(status, ""), self.colorize) + entry)
+        for header, expected, got in mismatches(status, entries):
+            self._lines.append(mismatch_str(self.colorize, header, expected=expected, got=got))
+
+        if len(self._lines) >= self.buffer_lines:
+            self.flush()
+
+    def flush(self):
+        if len(self._names) > 0:
+            self.err.write("\n".join(self._names) + "\n")
+            self._names = []
+
+        if len(self._lines) > 0:
+            self.file.write("\n".join(self._lines) + "\n")
+            self._lines = []
+
+    def close(self):
+        self.flush()
+
+
+class SummaryReporter(Reporter):
+    """only counts the entries per status and writes the totals"""
+
+    def __init__(self, file=sys.stdout):
+        self.file = file
+        self.counts = OrderedDict()
+
+    def report(self, entry, status, entries):
+        self.counts[status] = self.counts.get(status, 0) + 1
+
+    def close(self):
+        for status, count in self.counts.items():
+            print("{0:<10} {1}".format(status, count), file=self.file)
+
+
+class JsonReporter(Reporter):
+    """streams one json line per entry with its mismatches, followed by the totals"""
+
+    def __init__(self, file_name: str):
+        self.file = open(file_name, "w+")
+        self.counts = OrderedDict()
+
+    def report(self, entry, status, entries):
+        self.counts[status] = self.counts.get(status, 0) + 1
+
+        record = OrderedDict()
+        record["entry"] = entry
+        record["status"] = status
+        record["mismatches"] = [
+            OrderedDict([("header", header), ("expected", expected), ("got", got)])
+            for header, expected, got in mismatches(status, entries)
+        ]
+        self.file.write(jsonDumps(record, default=json_default) + "\n")
+
+    def close(self):
+        self.file.write(jsonDumps(OrderedDict([("summary", self.counts)])) + "\n")
+        self.file.close()
+
+
+class JUnitReporter(Reporter):
+    """streams a junit xml report, the test cases are spooled to a temporary file since
+    the totals have to be written ahead of them
+    """
+
+    def __init__(self, file_name: str, suite_name="parselog"):
+        self.file_name = file_name
+        self.suite_name = suite_name
+        self.counts = OrderedDict([("tests", 0), ("failures", 0)])
+        self._spool = TemporaryFile("w+")
+
+    def report(self, entry, status, entries):
+        self.counts["tests"] += 1
+
+        self._spool.write("    <testcase classname=" + quoteattr(self.suite_name))
+        self._spool.write(" name=" + quoteattr(entry))
+        if status == "Ok":
+            self._spool.write("/>\n")
+            return
+
+        self.counts["failures"] += 1
+        details = [
+            mismatch_str(False, header, expected=expected, got=got)
+            for header, expected, got in mismatches(status, entries)
+        ]
+        self._spool.write(">\n      <failure message=" + quoteattr(status) + ">")
+        self._spool.write(escape("\n".join(details)))
+        self._spool.write("</failure>\n    </testcase>\n")
+
+    def close(self):
+        with open(self.file_name, "w+") as junit_file:
+            junit_file.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            junit_file.write(
+                "<testsuite name="
+                + quoteattr(self.suite_name)
+                + ' tests="'
+                + str(self.counts["tests"])
+                + '" failures="'
+                + str(self.counts["failures"])
+                + '">\n'
+            )
+
+            self._spool.seek(0)
+            for line in self._spool:
+                junit_file.write(line)
+
+            junit_file.write("</testsuite>\n")
+
+        self._spool.close()
+
+
+class MultiReporter(Reporter):
+    """hands every entry to a list of reporters"""
+
+    def __init__(self, reporter_list: list):
+        self.reporter_list = reporter_list
+
+    def report(self, entry, status, entries):
+        for reporter in self.reporter_list:
+            reporter.report(entry, status, entries)
+
+    def close(self):
+        for reporter in self.reporter_list:
+            reporter.close()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+"""[summary]
+rows reading their missing headers from a defaults table shared by the whole table,
+rather than holding a copy of every default
+"""
+
+# We use OrderedDict in place of dict to
+# keep the ordering from the toml
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from copy import deepcopy
+
+
+class DefaultedRow(MutableMapping):
+    """a row overlaying its own values on a shared defaults table. It reads like the row
+    decompress_tbl or set_default would have filled: its own headers in order followed by
+    the defaults it does not have. Mutable defaults are copied into the row when read so
+    the shared table is never modified.
+    """
+
+    __slots__ = ("values", "defaults", "fill_none", "overrides", "removed")
+
+    def __init__(self, values=None, defaults=None, fill_none=True):
+        """
+        Args:
+            values (OrderedDict, optional): the values of the row itself
+            defaults (OrderedDict, optional): the shared defaults
+            fill_none (bool, optional): None values also read the default, like decompress_tbl
+        """
+        self.values = values if values is not None else OrderedDict()
+        self.defaults = defaults if defaults is not None else OrderedDict()
+        self.fill_none = fill_none
+        # values set after the fact, over a default they keep the position of the default
+        # otherwise they come last like they would in a dict
+        self.overrides = None
+        self.removed = None
+
+    def _has_own(self, header):
+        if header not in self.values:
+            return False
+
+        return not self.fill_none or self.values[header] is not None
+
+    def _has_default(self, header):
+        return header in self.defaults and (self.removed is None or header not in self.removed)
+
+    def __getitem__(self, header):
+        if self._has_own(header):
+            return self.values[header]
+
+        if self.overrides is not None and header in self.overrides:
+            return self.overrides[header]
+
+        if self._has_default(header):
+            value = self.defaults[header]
+            if isinstance(value, (list, dict)):
+                value = deepcopy(value)
+                if header in self.values:
+                    self.values[header] = value
+                else:
+                    self._override(header, value)
+
+            return value
+
+        if header in self.values:
+            return self.values[header]
+
+        raise KeyError(header)
+
+    def _override(self, header, value):
+        if self.overrides is None:
+            self.overrides = OrderedDict()
+
+        self.overrides[header] = value
+
+    def __setitem__(self, header, value):
+        if header in self.values:
+            self.values[header] = value
+        else:
+            self._override(header, value)
+
+    def __delitem__(self, header):
+        if header not in self:
+            raise KeyError(header)
+
+        self.values.pop(header, None)
+        if self.overrides is not None:
+            self.overrides.pop(header, None)
+
+        if header in self.defaults:
+            if self.removed is None:
+                self.removed = set()
+            self.removed.add(header)
+
+    def __contains__(self, header):
+        return (
+            header in self.values
+            or (self.overrides is not None and header in self.overrides)
+            or self._has_default(header)
+        )
+
+    def __iter__(self):
+        for header in self.values:
+            yield header
+
+        for header in self.defaults:
+            if header not in self.values and (self.removed is None or header not in self.removed):
+                yield header
+
+        if self.overrides is not None:
+            for header in self.overrides:
+                if header not in self.values and not self._has_default(header):
+                    yield header
+
+    def __len__(self):
+        return len([header for header in self])
+
+    def __repr__(self):
+        return "DefaultedRow(" + repr(self.expand()) + ")"
+
+    def expand(self) -> OrderedDict:
+        """builds the fully filled row
+
+        Returns:
+            OrderedDict: a copy of the row with every default filled in
+        """
+        return OrderedDict([(header, self[header]) for header in self])
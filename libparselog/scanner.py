@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+"""[summary]
+keeps track of which headers are worth trying on the current line of a log
+"""
+
+from itertools import islice
+
+
+class HeaderScanner:
+    """the set of candidate headers for a single log, headers are dropped once they are
+    satisfied and sectioned headers are only tried while their section is open
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.satisfied = set()
+        self.open_sections = set()
+        self.candidates = []
+        self.window_candidates = []
+        self.generation = 0
+        self._refresh()
+
+    def _refresh(self):
+        # keep the toml ordering so the values are inserted in the same order,
+        # headers with a window of lines are kept apart since they do not only depend on the line
+        self.candidates = []
+        self.window_candidates = []
+        for header in self.driver.get_header_list():
+            if header in self.satisfied:
+                continue
+
+            section = self.driver.get_section(header)
+            if section is None or section in self.open_sections:
+                if self.driver.get_window(header) > 1:
+                    self.window_candidates.append(header)
+                else:
+                    self.candidates.append(header)
+
+        if self.driver.match_cache is not None:
+            self.generation = self.driver.match_cache.generation(self.candidates)
+
+    def update_sections(self, line: str) -> bool:
+        """open and close the sections on their anchors, an end anchor is not part of
+        its section while a start anchor is
+
+        Args:
+            line (str): the current processed line
+
+        Returns:
+            bool: if the candidates changed
+        """
+        changed = False
+        for section, (start_re, end_re) in self.driver.sections.items():
+            if section in self.open_sections:
+                if end_re is not None and end_re.match(line) is not None:
+                    self.open_sections.discard(section)
+                    changed = True
+            elif start_re.match(line) is not None:
+                self.open_sections.add(section)
+                changed = True
+
+        if changed:
+            self._refresh()
+
+        return changed
+
+    def match(self, line: str) -> list:
+        """tries the candidates on the line
+
+        Args:
+            line (str): the current processed line
+
+        Returns:
+            list: the (header, value) captured on the line
+        """
+        captures = []
+        for header in self.candidates:
+            value = self.driver.regex_line(header, line)
+            if value is not None and value != "":
+                captures.append((header, value))
+
+        return captures
+
+    def match_window(self, window) -> list:
+        """tries the windowed candidates on the last lines, a header with a window of N lines
+        is matched against the N lines ending on the current one once that many were read
+
+        Args:
+            window (deque): the last processed lines, the current one last
+
+        Returns:
+            list: the (header, value) captured on the window
+        """
+        captures = []
+        for header in self.window_candidates:
+            size = self.driver.get_window(header)
+            if len(window) < size:
+                continue
+
+            value = self.driver.regex_line(header, "".join(islice(window, len(window) - size, None)))
+            if value is not None and value != "":
+                captures.append((header, value))
+
+        return captures
+
+    def merge(self, captures: list, window_captures: list) -> list:
+        """interleave the captures of the line and of the window back into the toml order"""
+        if len(window_captures) == 0:
+            return captures
+
+        if len(captures) == 0:
+            return window_captures
+
+        position = {header: index for index, header in enumerate(self.driver.get_header_list())}
+        return sorted(captures + window_captures, key=lambda capture: position[capture[0]])
+
+    def satisfy(self, header_list: list):
+        self.satisfied.update(header_list)
+        self._refresh()
+
+    def is_complete(self) -> bool:
+        return len(self.satisfied) == len(self.driver.get_header_list())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+"""[summary]
+numeric series for the listing headers matching on every iteration of a run, ie: the loss
+or the time of each step. The values go straight into a typed array, or are reduced to
+what the toml asks for, rather than being held as a list of python objects:
+
+    series = "array"               every value, as doubles
+    series = "count"               the number of matches
+    series = "sum", "min", "max"   a single number
+    series = { last = 100 }        the last 100 values
+    series = { downsample = 1000 } at most 1000 values spread evenly over the run
+
+a log without a match holds 0 for a count or a sum, the default of the toml otherwise
+"""
+
+import sys
+
+from array import array
+from collections import deque
+
+from libparselog.utils import sanitize_value
+
+SERIES_ARRAY = "array"
+SERIES_COUNT = "count"
+SERIES_SUM = "sum"
+SERIES_MIN = "min"
+SERIES_MAX = "max"
+SERIES_LAST = "last"
+SERIES_DOWNSAMPLE = "downsample"
+
+REDUCTIONS = [SERIES_ARRAY, SERIES_COUNT, SERIES_SUM, SERIES_MIN, SERIES_MAX]
+BOUNDED_REDUCTIONS = [SERIES_LAST, SERIES_DOWNSAMPLE]
+
+
+def is_valid_series(series) -> bool:
+    if isinstance(series, str):
+        return series in REDUCTIONS
+
+    if isinstance(series, dict) and len(series) == 1:
+        reduction, size = next(iter(series.items()))
+        return (
+            reduction in BOUNDED_REDUCTIONS
+            and isinstance(size, int)
+            and not isinstance(size, bool)
+            and size >= 1
+        )
+
+    return False
+
+
+def is_scalar_series(series) -> bool:
+    """the series reduces to a single number rather than an array"""
+    return series in [SERIES_COUNT, SERIES_SUM, SERIES_MIN, SERIES_MAX]
+
+
+def empty_series_value(series):
+    """what the record holds when the series matched nothing, a count or a sum of nothing is 0"""
+    if series in [SERIES_COUNT, SERIES_SUM]:
+        return 0
+
+    return None
+
+
+class NumericSeries:
+    """accumulates the matches of a header while its log is parsed, see ParseDriver.insert_value.
+    The parsed record holds its result, an array of doubles or a number.
+    """
+
+    __slots__ = ("header", "append", "values", "total", "size", "stride", "seen", "result")
+
+    def __init__(self, header: str, series):
+        """
+        Args:
+            header (str): the header, for the errors
+            series (Union[str, dict]): the series entry of the toml, see is_valid_series
+        """
+        self.header = header
+        self.values = None
+        self.total = None
+
+        reduction = series
+        if isinstance(series, dict):
+            reduction, self.size = next(iter(series.items()))
+
+        if reduction == SERIES_ARRAY:
+            self.values = array("d")
+            self.append = self._append_array
+            self.result = self._result_array
+        elif reduction == SERIES_COUNT:
+            self.total = 0
+            self.append = self._append_count
+            self.result = self._result_total
+        elif reduction == SERIES_SUM:
+            self.total = 0
+            self.append = self._append_sum
+            self.result = self._result_total
+        elif reduction == SERIES_MIN:
+            self.append = self._append_min
+            self.result = self._result_total
+        elif reduction == SERIES_MAX:
+            self.append = self._append_max
+            self.result = self._result_total
+        elif reduction == SERIES_LAST:
+            self.values = deque(maxlen=self.size)
+            self.append = self._append_last
+            self.result = self._result_array
+        else:
+            # keep every stride-th value, the stride doubles each time the buffer fills up
+            self.values = array("d")
+            self.stride = 1
+            self.seen = 0
+            self.append = self._append_downsample
+            self.result = self._result_array
+
+    def _number(self, value) -> float:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            print(
+                "ERROR: "
+                + self.header
+                + " is a numeric series but matched the value "
+                + str(value)
+            )
+            sys.exit(255)
+
+        return value
+
+    def _append_array(self, value):
+        self.values.append(self._number(value))
+
+    def _append_count(self, value):
+        self.total += 1
+
+    def _append_sum(self, value):
+        self.total += self._number(value)
+
+    def _append_min(self, value):
+        value = self._number(value)
+        if self.total is None or value < self.total:
+            self.total = value
+
+    def _append_max(self, value):
+        value = self._number(value)
+        if self.total is None or value > self.total:
+            self.total = value
+
+    def _append_last(self, value):
+        self.values.append(self._number(value))
+
+    def _append_downsample(self, value):
+        value = self._number(value)
+        if self.seen % self.stride == 0:
+            self.values.append(value)
+            if len(self.values) > self.size:
+                self.values = self.values[::2]
+                self.stride *= 2
+
+        self.seen += 1
+
+    def _result_array(self):
+        if isinstance(self.values, array):
+            return self.values
+
+        return array("d", self.values)
+
+    def _result_total(self):
+        if self.total is None:
+            return None
+
+        return sanitize_value(self.total)
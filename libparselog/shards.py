@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+"""[summary]
+splits a table in shard files partitioned on the entry keys, a small manifest records
+how the keys were partitioned so only the shards holding the wanted keys are opened
+"""
+
+# We use OrderedDict in place of dict to
+# keep the ordering from the toml
+from collections import OrderedDict
+
+import os
+import re
+
+from zlib import crc32
+
+from libparselog.utils import dump_json, load_json, assertion
+
+MANIFEST = "manifest.json"
+
+SCHEME_HASH = "hash"
+SCHEME_PREFIX = "prefix"
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def is_sharded(path: str) -> bool:
+    return os.path.isdir(path) and os.path.isfile(os.path.join(path, MANIFEST))
+
+
+def shard_of(manifest: OrderedDict, key: str) -> str:
+    """find the shard holding a key
+
+    Args:
+        manifest (OrderedDict): the manifest of the sharded table
+        key (str): the entry key, as made by ParseDriver.generate_key
+
+    Returns:
+        str: the shard id
+    """
+    if manifest["scheme"] == SCHEME_PREFIX:
+        return _UNSAFE_CHARS.sub("_", key[: manifest["length"]]) or "_"
+
+    return "{0:04d}".format(crc32(key.encode("utf-8")) % manifest["count"])
+
+
+def load_manifest(directory: str) -> OrderedDict:
+    manifest = load_json(os.path.join(directory, MANIFEST))
+    assertion(
+        manifest.get("scheme") in (SCHEME_HASH, SCHEME_PREFIX),
+        "unknown sharding scheme in " + os.path.join(directory, MANIFEST),
+    )
+    return manifest
+
+
+def shard_files(directory: str, keys=None) -> list:
+    """list the shard files to load
+
+    Args:
+        directory (str): the sharded table
+        keys (Iterable[str], optional): only the shards holding these keys. Defaults to all.
+
+    Returns:
+        list: the path to the shard files
+    """
+    manifest = load_manifest(directory)
+
+    shard_ids = manifest["shards"].keys()
+    if keys is not None:
+        wanted = set(shard_of(manifest, key) for key in keys)
+        shard_ids = [shard_id for shard_id in shard_ids if shard_id in wanted]
+
+    return [os.path.join(directory, manifest["shards"][shard_id]) for shard_id in shard_ids]
+
+
+def write_shards(tbl: OrderedDict, directory: str, dump_fn, scheme=SCHEME_HASH, size=64, ext=".json"):
+    """partition the table and write one file per shard along with the manifest
+
+    Args:
+        tbl (OrderedDict): the table to shard, without its DEFAULT entry
+        directory (str): where to write the shards
+        dump_fn (Callable): dump_fn(sub_table, file_name) writes one shard
+        scheme (str, optional): partition on a hash or a prefix of the key. Defaults to hash.
+        size (int, optional): the number of shards for hash or the prefix length. Defaults to 64.
+        ext (str, optional): the extension of the shard files. Defaults to ".json".
+    """
+    assertion(scheme in (SCHEME_HASH, SCHEME_PREFIX), "unknown sharding scheme " + scheme)
+    assertion(size > 0, "the shard count or prefix length must be positive")
+
+    manifest = OrderedDict()
+    manifest["scheme"] = scheme
+    if scheme == SCHEME_HASH:
+        manifest["count"] = size
+    else:
+        manifest["length"] = size
+
+    shards = OrderedDict()
+    for key in tbl:
+        shard_id = shard_of(manifest, key)
+        if shard_id not in shards:
+            shards[shard_id] = OrderedDict()
+
+        shards[shard_id][key] = tbl[key]
+
+    os.makedirs(directory, exist_ok=True)
+
+    manifest["shards"] = OrderedDict()
+    for shard_id in sorted(shards):
+        manifest["shards"][shard_id] = "shard_" + shard_id + ext
+        dump_fn(shards[shard_id], os.path.join(directory, manifest["shards"][shard_id]))
+
+    with open(os.path.join(directory, MANIFEST), "w+") as manifest_file:
+        dump_json(manifest, file=manifest_file)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+
+"""[summary]
+aggregates the numeric columns of results in a single pass and bounded memory,
+the quantiles come from a sketch so millions of rows never need to be held at once
+"""
+
+# We use OrderedDict in place of dict to
+# keep the ordering from the toml
+from collections import OrderedDict
+
+import math
+
+from array import array
+
+from typing import Iterable
+
+
+class QuantileSketch:
+    """a KLL style sketch, values are buffered per level and a full level is sorted and
+    halved into the next one where each value weighs twice as much. The memory stays in
+    the order of k * log(n / k) and the rank error in the order of 1 / k.
+    """
+
+    def __init__(self, k=256):
+        self.k = k
+        self.levels = [[]]
+        # alternate which half survives a compaction so the error does not drift one way
+        self._offsets = [0]
+
+    def add(self, value: float):
+        self.levels[0].append(value)
+        if len(self.levels[0]) >= self.k:
+            self._compact(0)
+
+    def _compact(self, level: int):
+        if level + 1 == len(self.levels):
+            self.levels.append([])
+            self._offsets.append(0)
+
+        values = sorted(self.levels[level])
+        offset = self._offsets[level]
+        self._offsets[level] = 1 - offset
+
+        # an odd value out stays behind
+        kept = []
+        if len(values) % 2 == 1:
+            kept = [values.pop()]
+
+        self.levels[level] = kept
+        self.levels[level + 1] += values[offset::2]
+        if len(self.levels[level + 1]) >= self.k:
+            self._compact(level + 1)
+
+    def quantiles(self, fractions: Iterable[float]) -> list:
+        """
+        Args:
+            fractions (Iterable[float]): the quantiles to estimate, between 0 and 1
+
+        Returns:
+            list: the estimates, None when nothing was added
+        """
+        weighted = sorted(
+            [(value, 1 << level) for level, values in enumerate(self.levels) for value in values]
+        )
+        total = sum([weight for _, weight in weighted])
+
+        estimates = []
+        for fraction in fractions:
+            if total == 0:
+                estimates.append(None)
+                continue
+
+            rank = fraction * total
+            seen = 0
+            estimate = weighted[-1][0]
+            for value, weight in weighted:
+                seen += weight
+                if seen >= rank:
+                    estimate = value
+                    break
+
+            estimates.append(estimate)
+
+        return estimates
+
+
+class ColumnStats:
+    """count, min, max, mean and standard deviation with Welford's algorithm, and the
+    quantiles through a sketch. Values that are not numbers are only counted as such.
+    """
+
+    def __init__(self, sketch_size=256):
+        self.count = 0
+        self.skipped = 0
+        self.minimum = None
+        self.maximum = None
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.sketch = QuantileSketch(sketch_size)
+
+    def add(self, value):
+        # listing headers contribute each of their values
+        if isinstance(value, (list, array)):
+            for item in value:
+                self.add(item)
+            return
+
+        if value is None:
+            return
+
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or math.isnan(value):
+            self.skipped += 1
+            return
+
+        self.count += 1
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        self.sketch.add(value)
+
+    def report(self, quantiles: Iterable[float]) -> OrderedDict:
+        report = OrderedDict()
+        report["count"] = self.count
+        report["not-numeric"] = self.skipped
+        report["min"] = self.minimum
+        report["max"] = self.maximum
+        report["mean"] = self.mean if self.count > 0 else None
+        report["stddev"] = math.sqrt(self._m2 / self.count) if self.count > 0 else None
+
+        quantiles = list(quantiles)
+        for fraction, estimate in zip(quantiles, self.sketch.quantiles(quantiles)):
+            report["p" + "{0:g}".format(fraction * 100)] = estimate
+
+        return report
+
+
+class TableStats:
+    """the statistics of each header, optionally split in groups sharing a key prefix"""
+
+    def __init__(self, header_list: Iterable[str], group_prefix=0, sketch_size=256):
+        """
+        Args:
+            header_list (Iterable[str]): the headers to aggregate
+            group_prefix (int, optional): group the entries on the first characters of their
+                key, 0 puts them all in one group. Defaults to 0.
+            sketch_size (int, optional): the size of the quantile sketch levels
+        """
+        self.header_list = list(header_list)
+        self.group_prefix = group_prefix
+        self.sketch_size = sketch_size
+        self.groups = OrderedDict()
+
+    def add(self, key: str, row):
+        group = "*"
+        if self.group_prefix > 0:
+            group = key[: self.group_prefix]
+
+        if group not in self.groups:
+            self.groups[group] = OrderedDict(
+                [(header, ColumnStats(self.sketch_size)) for header in self.header_list]
+            )
+
+        for header in self.header_list:
+            if header in row:
+                self.groups[group][header].add(row[header])
+
+    def report(self, quantiles=(0.5, 0.9, 0.99)) -> OrderedDict:
+        """
+        Args:
+            quantiles (Iterable[float], optional): the quantiles to report
+
+        Returns:
+            OrderedDict: the statistics of each header of each group
+        """
+        return OrderedDict(
+            [
+                (
+                    group,
+                    OrderedDict(
+                        [(header, stats.report(quantiles)) for header, stats in columns.items()]
+                    ),
+                )
+                for group, columns in self.groups.items()
+            ]
+        )
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+"""[summary]
+reads a log backwards from its end, for the headers marked from-end whose values are
+printed last ie: the runtime or the peak memory, so they are found without reading the log
+"""
+
+# We use OrderedDict in place of dict to
+# keep the ordering from the toml
+from collections import OrderedDict
+
+import os
+
+from typing import BinaryIO, Iterator
+
+_BLOCK_SIZE = 1 << 16
+
+
+def iter_lines_reversed(log: BinaryIO, block_size=_BLOCK_SIZE) -> Iterator[str]:
+    """the lines of a seekable file from the last to the first, as iterating over the
+    file would give them: decoded with their line ending turned into a newline
+
+    Args:
+        log (BinaryIO): the file opened in binary mode
+        block_size (int, optional): how much is read at once
+
+    Yields:
+        str: the lines, last first
+    """
+    position = log.seek(0, os.SEEK_END)
+    remainder = b""
+    at_end = True
+    while position > 0:
+        size = min(block_size, position)
+        position -= size
+        log.seek(position)
+        lines = (log.read(size) + remainder).split(b"\n")
+
+        # the first piece may be the end of a line starting in the previous block
+        remainder = lines[0]
+        for index in range(len(lines) - 1, 0, -1):
+            # the file ends with a newline, there is no line after it
+            if at_end:
+                at_end = False
+                if lines[index] == b"":
+                    continue
+                yield _decode(lines[index], False)
+            else:
+                yield _decode(lines[index], True)
+
+    if at_end:
+        if remainder != b"":
+            yield _decode(remainder, False)
+    else:
+        yield _decode(remainder, True)
+
+
+def _decode(line: bytes, newline: bool) -> str:
+    if line.endswith(b"\r"):
+        line = line[:-1]
+
+    return line.decode() + ("\n" if newline else "")
+
+
+def scan_tail(driver, log_file_name: str) -> OrderedDict:
+    """matches the from-end headers on the log read backwards, a header is done with its
+    first match from the end since that is the value the forward parse would keep
+
+    Args:
+        driver (ParseDriver): the driver for the parse
+        log_file_name (str): the preprocessed log
+
+    Returns:
+        OrderedDict: the values found in the toml order, or None when the log can not
+            be read backwards
+    """
+    pending = list(driver.tail_headers)
+    found = {}
+    with open(log_file_name, "rb") as log:
+        if not log.seekable():
+            return None
+
+        for line in iter_lines_reversed(log):
+            line = driver.hooks.do_process(line)
+            for header in list(pending):
+                value = driver.regex_line(header, line)
+                if value is None or value == "":
+                    continue
+
+                found[header] = value
+                pending.remove(header)
+
+            if len(pending) == 0:
+                break
+
+    return OrderedDict(
+        [(header, found[header]) for header in driver.tail_headers if header in found]
+    )
@@ -57,12 +57,18 @@ class Toml:
         Returns:
             str: the flattend toml file
         """
+        # a string is read line by line like a file
+        if isinstance(content, str):
+            content = content.splitlines(keepends=True)
+
         output_str = ""
         for line in content:
             if line.startswith(self.include_cmd + " "):
                 # import the next file in line
-                next_file = line.strip(self.include_cmd).strip()
+                next_file = line[len(self.include_cmd) :].strip()
                 output_str += self._flatten_toml_file(next_file, local_search_path)
+            else:
+                output_str += line
 
         return output_str
 
@@ -87,14 +93,15 @@ class Toml:
 
         # start the lookup for the file from the top of the stack
         for paths in local_search_path.split(':'):
-            if os.path.exists(paths + file_path):
+            candidate = os.path.join(paths, file_path)
+            if os.path.exists(candidate):
                 # extract the directory
-                directory = os.path.dirname(file_path)
+                directory = os.path.dirname(candidate)
                 if directory != "":
                     os.chdir(directory)
 
                 # read it as a string and flatten it
-                with open(file_path) as current_file:
+                with open(os.path.basename(candidate)) as current_file:
                     content = self._flatten_toml_string(current_file, local_search_path)
 
                 # get back to the previous path and pop it
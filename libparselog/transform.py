@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+"""[summary]
+the line transforms declared in the TRANSFORM entry of the toml, the common process hooks
+ie: stripping the colors or the timestamps, compiled once into a single call per line
+
+    [TRANSFORM]
+    strip-prefix = ["[INFO]", "[WARN]"]
+    delete = "\\x1b\\r"
+    substitute = [["\\[[0-9;]*m", ""], ["^\\s*[0-9:.]+\\s", ""]]
+
+the prefix is stripped first, then the characters deleted and the substitutions made in order,
+ie: "[INFO] \\x1b[1m12:00:01.5 time 12\\x1b[0m\\r" becomes "time 12". The toml trims the
+whitespace around its strings, the space left after the prefix is matched with \\s in a
+substitution, a replacement can not be whitespace.
+"""
+
+import re
+
+from typing import Optional
+
+from libparselog.utils import assertion
+
+_T_STRIP_PREFIX = "strip-prefix"
+_T_DELETE = "delete"
+_T_SUBSTITUTE = "substitute"
+
+
+def _unescape(value: str) -> str:
+    # the toml keeps the backslashes as is, so \t or \x1b are read as python would
+    return value.encode("latin-1", "backslashreplace").decode("unicode_escape")
+
+
+class LineTransform:
+    """the compiled transform, called on each line before the process hooks"""
+
+    def __init__(self, transform_entries):
+        """
+        Args:
+            transform_entries (OrderedDict): the TRANSFORM entry of the toml
+        """
+        for key in transform_entries:
+            assertion(
+                key in [_T_STRIP_PREFIX, _T_DELETE, _T_SUBSTITUTE],
+                "invalid option: " + key + " passed into the entry [TRANSFORM]",
+            )
+
+        # the prefixes are tried in order in a single regex, the first one found is stripped
+        self.prefix_re = None
+        prefix_list = transform_entries.get(_T_STRIP_PREFIX, [])
+        if isinstance(prefix_list, str):
+            prefix_list = [prefix_list]
+
+        assertion(
+            all([isinstance(prefix, str) for prefix in prefix_list]),
+            _T_STRIP_PREFIX + " in toml[TRANSFORM] is expected to be a list of strings",
+        )
+        if len(prefix_list) > 0:
+            self.prefix_re = re.compile(
+                "|".join([re.escape(_unescape(prefix)) for prefix in prefix_list])
+            )
+
+        # deleting characters is a single translate
+        self.delete_tbl = None
+        deleted = transform_entries.get(_T_DELETE, "")
+        assertion(
+            isinstance(deleted, str),
+            _T_DELETE + " in toml[TRANSFORM] is expected to be a string of characters",
+        )
+        deleted = _unescape(deleted)
+        assertion(
+            "\n" not in deleted,
+            _T_DELETE + " in toml[TRANSFORM] can not delete the end of the lines",
+        )
+        if len(deleted) > 0:
+            self.delete_tbl = str.maketrans("", "", deleted)
+
+        self.substitutions = []
+        for substitution in transform_entries.get(_T_SUBSTITUTE, []):
+            assertion(
+                isinstance(substitution, list)
+                and len(substitution) == 2
+                and all([isinstance(part, str) for part in substitution]),
+                _T_SUBSTITUTE + " in toml[TRANSFORM] must be of format '[[regex, replacement], ...]'",
+            )
+            self.substitutions.append((re.compile(substitution[0]), substitution[1]))
+
+    def is_empty(self) -> bool:
+        return self.prefix_re is None and self.delete_tbl is None and len(self.substitutions) == 0
+
+    def __call__(self, line: str) -> str:
+        if self.prefix_re is not None:
+            prefix = self.prefix_re.match(line)
+            if prefix is not None:
+                line = line[prefix.end() :]
+
+        if self.delete_tbl is not None:
+            line = line.translate(self.delete_tbl)
+
+        for regex, replacement in self.substitutions:
+            line = regex.sub(replacement, line)
+
+        return line
+
+
+def compile_transform(transform_entries) -> Optional[LineTransform]:
+    """
+    Args:
+        transform_entries (OrderedDict): the TRANSFORM entry of the toml
+
+    Returns:
+        LineTransform: the transform or None when there is nothing to do
+    """
+    transform = LineTransform(transform_entries)
+    if transform.is_empty():
+        return None
+
+    return transform
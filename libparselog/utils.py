@@ -6,15 +6,23 @@
 # We use OrderedDict in place of dict to
 # keep the ordering from the toml
 from collections import OrderedDict
+from collections.abc import Mapping
+from array import array
 
 import sys
 import os
 
 from json import load as jsonLoad
 from json import dumps as jsonDumps
+from json import JSONDecoder, JSONDecodeError
 from csv import reader as csvReader
 
 from types import FunctionType
+from typing import Any, Iterable, Iterator, Tuple
+
+from libparselog.compression import open_table
+
+_CHUNK_SIZE = 1 << 20
 
 
 def colored(input_str, color, colorize):
@@ -95,6 +103,10 @@ def sanitize_value(value):
             value[i] = sanitize_value(value[i])
         return value
 
+    # the numeric series are already numbers
+    if isinstance(value, array):
+        return value
+
     if isinstance(value, dict):
         for key in value:
             value[key] = sanitize_value(value[key])
@@ -112,7 +124,8 @@ def dump_csv(driver, output_dict, file=sys.stdout):
         result_lines.append(list())
 
     for header in driver.get_header_list():
-        if driver.is_multivalued(header):
+        # the series reduced to a number have a column, unlike the other listings
+        if driver.is_multivalued(header) and not driver.is_scalar_series(header):
             continue
 
         # figure out the pad
@@ -136,13 +149,129 @@ def dump_csv(driver, output_dict, file=sys.stdout):
         print(", ".join(row), file=file)
 
 
+def json_default(value):
+    """lets json serialize what is not a plain dict or list, ie: DefaultedRow
+
+    Args:
+        value: the object json could not serialize
+
+    Returns:
+        a json serializable equivalent
+    """
+    if isinstance(value, Mapping):
+        return OrderedDict(value.items())
+
+    # a numeric series, whole numbers are written as the int they were parsed from
+    if isinstance(value, array):
+        return sanitize_value(value.tolist())
+
+    raise TypeError("Object of type " + type(value).__name__ + " is not JSON serializable")
+
+
 def dump_json(output_dict, file=sys.stdout):
-    print(jsonDumps(output_dict, indent=4), file=file)
+    print(jsonDumps(output_dict, indent=4, default=json_default), file=file)
+
+
+def dump_json_stream(items: Iterable[Tuple[str, Any]], file=sys.stdout):
+    """writes the (key, value) pairs as the members of one json object as they come,
+    the output is the same as dump_json would give for the whole table
+
+    Args:
+        items (Iterable[Tuple[str, Any]]): the members to write
+        file (File_obj, optional): where to write. Defaults to sys.stdout.
+    """
+    separator = "\n"
+    file.write("{")
+    for key, value in items:
+        file.write(separator + "    " + jsonDumps(key) + ": ")
+        file.write(jsonDumps(value, indent=4, default=json_default).replace("\n", "\n    "))
+        separator = ",\n"
+
+    if separator == "\n":
+        file.write("}\n")
+    else:
+        file.write("\n}\n")
+
+
+def iter_json(file_name) -> Iterator[Tuple[str, Any]]:
+    """streams the members of the top level object of a json file without loading
+    the whole file, the memory used is bound by the largest member
+
+    Args:
+        file_name (str): the json file to read
+
+    Yields:
+        Tuple[str, Any]: the key and the value of each member
+    """
+    decoder = JSONDecoder(object_pairs_hook=OrderedDict)
+
+    with open_table(file_name) as json_file:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def _refill():
+            nonlocal buffer, pos, eof
+            chunk = json_file.read(max(_CHUNK_SIZE, len(buffer)))
+            eof = chunk == ""
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+        def _next_char():
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+
+                if pos < len(buffer) or eof:
+                    break
+
+                _refill()
+
+            if pos < len(buffer):
+                return buffer[pos]
+
+            return ""
+
+        def _decode():
+            nonlocal pos
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                    # a number could be cut short at the end of the buffer
+                    if end < len(buffer) or eof:
+                        pos = end
+                        return value
+                except JSONDecodeError:
+                    if eof:
+                        raise
+
+                _refill()
+
+        def _expect(expected):
+            nonlocal pos
+            char = _next_char()
+            assertion(char in expected, "malformed json in " + file_name + ", expected " + expected)
+            pos += 1
+            return char
+
+        _expect("{")
+        if _next_char() == "}":
+            return
+
+        while True:
+            _next_char()
+            key = _decode()
+            _expect(":")
+            _next_char()
+            yield key, _decode()
+            if _expect(",}") == "}":
+                return
 
 
 def load_json(file_name):
     file_dict = OrderedDict()
-    with open(file_name, newline="") as json_file:
+    with open_table(file_name) as json_file:
         file_dict = jsonLoad(json_file, object_pairs_hook=OrderedDict)
 
     return file_dict
@@ -151,7 +280,7 @@ def load_json(file_name):
 def load_csv(csv_file_name):
     header = []
     file_dict = []
-    with open(csv_file_name, newline="") as csvfile:
+    with open_table(csv_file_name) as csvfile:
         is_header = True
         csv_reader = csvReader(csvfile)
         for row in csv_reader:
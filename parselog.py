@@ -8,136 +8,143 @@
 from collections import OrderedDict
 
 import sys
+import os
 import argparse
 
+from functools import partial
+
 from libparselog.utils import (
-    colored,
     dump_csv,
     dump_json,
+    dump_json_stream,
+    iter_json,
     load_json,
-    load_csv,
+    assertion,
 )
 
 from libparselog.parsedriver import ParseDriver
-
-_LEN = 38
-
-
-def satus_line(status, color, colorize):
-    output = (
-        colored("  " + status + " ", color, colorize)
-        + ". . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . ."
-    )
-    return output[:_LEN] + " "
-
-
-def mismatch_str(colorize, header, expected=None, got=None):
-    header = "{0:<{1}}".format("- " + header, _LEN)
-    if expected is None:
-        expected = ""
-    else:
-        expected = colored("[-" + str(expected) + "-]", "red", colorize)
-
-    if got is None:
-        got = ""
-    else:
-        got = colored("{+" + str(got) + "+}", "green", colorize)
-
-    return "    " + header + expected + got
+from libparselog.profiler import Profiler, phase
+from libparselog.discovery import iter_inputs
+from libparselog.asyncload import prefetch
+from libparselog.loader import (
+    decompress_row,
+    load_concurrently,
+    load_into_tbl,
+    read_log,
+    reads_by_key,
+    table_format,
+)
+from libparselog.compression import CODECS, compression_of, open_table
+from libparselog.reporter import (
+    JsonReporter,
+    JUnitReporter,
+    MultiReporter,
+    SummaryReporter,
+    TextReporter,
+)
+from libparselog.jsonl import concat_jsonl, dump_jsonl
+from libparselog.stats import TableStats
+from libparselog.api import iter_records
+from libparselog.fingerprint import FINGERPRINT_EXT, dump_fingerprints, load_fingerprints
+from libparselog.shards import SCHEME_HASH, SCHEME_PREFIX, write_shards
 
 
 def compress_tbl(driver, tbl):
-    # hide the one matching the condition
-    for entry in tbl:
-        tbl[entry] = driver.auto_hide_values(tbl[entry])
+    if driver.infer_default:
+        # the most frequent value of each column is hidden
+        hidden_tbl = driver.infer_hidden_tbl(tbl)
+        for entry in tbl:
+            tbl[entry] = driver.hide_values(tbl[entry], hidden_tbl)
+    else:
+        # hide the one matching the condition
+        hidden_tbl = driver.generate_hidden_tbl()
+        for entry in tbl:
+            tbl[entry] = driver.auto_hide_values(tbl[entry])
 
     # make sure that the defaults are printed as a separate table
-    tbl["DEFAULT"] = driver.generate_hidden_tbl()
+    tbl["DEFAULT"] = hidden_tbl
     return tbl
 
 
-def decompress_tbl(tbl):
-    # json are compressed using default table
-    if "DEFAULT" in tbl:
-        # once we have loaded the file, we go through and fill back the default
-        # we will delete the default, then this way we could merge two files with different defaults
-        # without issue
-        for entry in tbl:
-            if entry != "DEFAULT":
-                for header in tbl["DEFAULT"]:
-                    if entry not in tbl or header not in tbl[entry] or tbl[entry][header] is None:
-                        tbl[entry][header] = tbl["DEFAULT"][header]
+def open_output(driver, file_name):
+    # compressed when the name says so, ie: diff.json.gz
+    return open_table(file_name, "w", driver.compression_level, driver.compression_threads)
 
-        del tbl["DEFAULT"]
-    return tbl
 
+def write_tbl(driver, output_dict, file_name, as_csv=False):
+    """writes the table to a file, json lines tables are streamed along with their index
 
-def dump_tbl(driver, output_dict, as_csv, file=sys.stdout):
+    Args:
+        driver (ParseDriver): the driver for the table
+        output_dict (OrderedDict): the table to write
+        file_name (str): the output file
+        as_csv (bool, optional): write a csv rather than JSON. Defaults to False.
+    """
     if as_csv:
-        dump_csv(driver, output_dict, file=file)
-    else:
-        output_dict = compress_tbl(driver, output_dict)
-        dump_json(output_dict, file=file)
+        with open_output(driver, file_name) as output_file:
+            dump_tbl(driver, output_dict, as_csv, file=output_file)
+        return
 
+    with phase(driver.profiler, "output"):
+        output_dict = compress_tbl(driver, output_dict)
+        default_tbl = output_dict.pop("DEFAULT")
+
+    # fingerprint the rows as they read once loaded back, with their hidden values filled
+    fingerprints = None
+    if driver.fingerprint_file:
+        fingerprints = OrderedDict(
+            [
+                (entry, driver.fingerprint(decompress_row(output_dict[entry], default_tbl)))
+                for entry in output_dict
+            ]
+        )
 
-def load_log(driver, log_file_name) -> list:
-    # load log file and parse
-    log_file_name = driver.hooks.do_preprocess(log_file_name)
-
-    # setup our output dict
-    input_values = OrderedDict()
-
-    with open(log_file_name) as log:
-        for line in log:
-            line = driver.hooks.do_process(line)
-            for header in driver.get_header_list():
-                value = driver.regex_line(header, line)
-                if value is not None and value != "":
-                    input_values = driver.insert_value(input_values, header, value)
-
-    # load the defaults bfore post processing
-    input_values = driver.set_default(input_values)
-    input_values = driver.hooks.do_postprocess(input_values)
-
-    # reload the default to fill the table
-    input_values = driver.set_default(input_values)
-
-    # expects a list, but we only have one here
-    return [input_values]
+    with phase(driver.profiler, "output"):
+        if table_format(file_name) == ".jsonl":
+            dump_jsonl(
+                output_dict.items(),
+                file_name,
+                default_tbl,
+                level=driver.compression_level,
+                threads=driver.compression_threads,
+            )
+        else:
+            output_dict["DEFAULT"] = default_tbl
+            with open_output(driver, file_name) as output_file:
+                dump_json(output_dict, file=output_file)
 
+    if fingerprints is not None:
+        dump_fingerprints(file_name, driver.get_header_list(), fingerprints)
 
-def load_into_tbl(driver, file_name):
-    tbl = OrderedDict()
 
-    if file_name.endswith(".json"):
-        tbl = load_json(file_name)
-        tbl = decompress_tbl(tbl)
-    else:
-        data_list = []
-        if file_name.endswith(".csv"):
-            data_list = load_csv(file_name)
+def dump_tbl(driver, output_dict, as_csv, file=sys.stdout):
+    with phase(driver.profiler, "output"):
+        if as_csv:
+            dump_csv(driver, output_dict, file=file)
         else:
-            # we assume this is a log file
-            data_list = load_log(driver, file_name)
-
-        for data in data_list:
-            # make a key from the user desired key items
-            key = driver.generate_key(data)
-            tbl[key] = data
-
-    return tbl
+            output_dict = compress_tbl(driver, output_dict)
+            dump_json(output_dict, file=file)
 
 
-def parse(driver, file_list, as_csv=False):
+def parse(driver, file_list, as_csv=False, concurrency=0, read_ahead=64, output_file_name=None):
     # load toml
     parsed_files = OrderedDict()
     if isinstance(file_list, str):
         parsed_files.update(load_into_tbl(driver, file_list))
-    elif isinstance(file_list, (set, list)):
+    elif concurrency > 0:
+        # overlap the reads while we parse, the order of the inputs is kept
+        read_fn = partial(read_log, driver)
+        for files, content in prefetch(file_list, read_fn, concurrency, read_ahead):
+            parsed_files.update(load_into_tbl(driver, files, content))
+    else:
+        # any iterable works, so the inputs can be streamed in as they are discovered
         for files in file_list:
             parsed_files.update(load_into_tbl(driver, files))
 
-    dump_tbl(driver, parsed_files, as_csv)
+    if output_file_name is None:
+        dump_tbl(driver, parsed_files, as_csv)
+    else:
+        write_tbl(driver, parsed_files, output_file_name, as_csv)
 
 
 def compare(
@@ -148,84 +155,291 @@ def compare(
     as_csv=False,
     subset=False,
     colorize=True,
+    load_jobs=0,
+    delta=False,
+    reporter=None,
+    diff_jobs=0,
 ):
     # load toml
     failure_count = 0
-    expected = load_into_tbl(driver, golden_result_file_name)
-    got = load_into_tbl(driver, result_file_name)
-    diff = driver.do_diff(expected, got)
+    if subset and reads_by_key(golden_result_file_name):
+        # we need to know what we got to pick the golden shards or lines
+        got = load_into_tbl(driver, result_file_name)
+        expected = load_into_tbl(driver, golden_result_file_name, keys=got.keys())
+    elif load_jobs > 1:
+        expected, got = load_concurrently(
+            driver, [golden_result_file_name, result_file_name], load_jobs
+        )
+    else:
+        expected = load_into_tbl(driver, golden_result_file_name)
+        got = load_into_tbl(driver, result_file_name)
+
+    with phase(driver.profiler, "diff"):
+        # the golden sidecar spares hashing its rows again
+        fingerprints = load_fingerprints(golden_result_file_name, driver.get_header_list())
+        diff = driver.do_diff(expected, got, fingerprints, diff_jobs)
+    if reporter is None:
+        reporter = TextReporter(colorize)
+
     diff_tbl = OrderedDict()
     for entry in diff:
         diff_tbl[entry] = OrderedDict()
+        status = diff[entry]["__STATUS__"]
+        entries = diff[entry]["__ENTRIES__"]
 
         # subset are expected to have missing entries
-        if diff[entry]["__STATUS__"] == "Missing" and subset:
-            diff_tbl[entry][header] = diff[entry]["__ENTRIES__"][header]["__EXPECTED__"]
-        else:
-            print_color = ""
-            if diff[entry]["__STATUS__"] == "Ok":
-                print_color = "green"
-            else:
-                if diff[entry]["__STATUS__"] == "Failure":
-                    print_color = "red"
+        if status == "Missing" and subset:
+            for header in entries:
+                diff_tbl[entry][header] = entries[header]["__EXPECTED__"]
+            continue
+
+        reporter.report(entry, status, entries)
+        if status != "Ok":
+            failure_count += 1
+
+        for header in entries:
+            if status == "Ok":
+                diff_tbl[entry][header] = entries[header]["__EXPECTED__"]
+            elif status == "New":
+                diff_tbl[entry][header] = entries[header]["__GOT__"]
+            elif status == "Failed":
+                if entries[header]["__STATUS__"] == "Ok":
+                    diff_tbl[entry][header] = entries[header]["__EXPECTED__"]
                 else:
-                    print_color = "yellow"
-
-                # print to std error the failed test name
-                print(entry, file=sys.stderr)
-                failure_count += 1
-
-            print(satus_line(diff[entry]["__STATUS__"], print_color, colorize) + entry)
-
-            if diff[entry]["__STATUS__"] == "Ok":
-                for header in diff[entry]["__ENTRIES__"]:
-                    diff_tbl[entry][header] = diff[entry]["__ENTRIES__"][header]["__EXPECTED__"]
-
-            elif diff[entry]["__STATUS__"] == "Missing":
-                for header in diff[entry]["__ENTRIES__"]:
-                    print(
-                        mismatch_str(
-                            colorize,
-                            header,
-                            expected=diff[entry]["__ENTRIES__"][header]["__EXPECTED__"],
-                        )
-                    )
-                    # dont add it in the diff
-
-            elif diff[entry]["__STATUS__"] == "New":
-                for header in diff[entry]["__ENTRIES__"]:
-                    print(
-                        mismatch_str(
-                            colorize, header, got=diff[entry]["__ENTRIES__"][header]["__GOT__"]
-                        )
-                    )
-                    diff_tbl[entry][header] = diff[entry]["__ENTRIES__"][header]["__GOT__"]
-
-            elif diff[entry]["__STATUS__"] == "Failed":
-                for header in diff[entry]["__ENTRIES__"]:
-                    if diff[entry]["__ENTRIES__"][header]["__STATUS__"] == "Ok":
-                        diff_tbl[entry][header] = diff[entry]["__ENTRIES__"][header]["__EXPECTED__"]
-                    else:
-                        print(
-                            mismatch_str(
-                                colorize,
-                                header,
-                                expected=diff[entry]["__ENTRIES__"][header]["__EXPECTED__"],
-                                got=diff[entry]["__ENTRIES__"][header]["__GOT__"],
-                            )
-                        )
-                        diff_tbl[entry][header] = diff[entry]["__ENTRIES__"][header]["__GOT__"]
-
-    with open(diff_file_name, "w+") as diff_file:
-        dump_tbl(driver, diff_tbl, as_csv, file=diff_file)
+                    diff_tbl[entry][header] = entries[header]["__GOT__"]
+            # missing entries are not added to the diff
+
+    reporter.close()
+
+    if delta:
+        with phase(driver.profiler, "output"), open_output(driver, diff_file_name) as diff_file:
+            dump_json(generate_delta(driver, diff, expected, subset), file=diff_file)
+    else:
+        write_tbl(driver, diff_tbl, diff_file_name, as_csv)
 
     return failure_count
 
 
+def stats(
+    driver,
+    file_list,
+    group_prefix=0,
+    quantiles=(0.5, 0.9, 0.99),
+    concurrency=0,
+    read_ahead=64,
+    output_file_name=None,
+):
+    """aggregates the numeric headers of the inputs as they stream by, every record is
+    counted even when a later input holds the same key
+
+    Args:
+        driver (ParseDriver): the driver for the parse
+        file_list (Iterable[str]): the logs and tables to aggregate
+        group_prefix (int, optional): group the entries on that many leading characters of
+            their key. Defaults to 0, a single group.
+        quantiles (Iterable[float], optional): the quantiles to estimate
+        concurrency (int, optional): the logs to read ahead in the background
+        read_ahead (int, optional): the most logs held in memory ahead of the parse
+        output_file_name (str, optional): write the statistics there rather than stdout
+    """
+    table_stats = TableStats(
+        [header for header in driver.get_header_list() if not driver.is_key(header)],
+        group_prefix,
+    )
+
+    with phase(driver.profiler, "stats"):
+        for key, row in iter_records(driver, file_list, concurrency, read_ahead):
+            table_stats.add(key, row)
+
+    with phase(driver.profiler, "output"):
+        if output_file_name is None:
+            dump_json(table_stats.report(quantiles))
+        else:
+            with open_output(driver, output_file_name) as output_file:
+                dump_json(table_stats.report(quantiles), file=output_file)
+
+    return 0
+
+
+def shard(driver, file_list, directory, scheme=SCHEME_HASH, size=64, ext=".json"):
+    parsed_files = OrderedDict()
+    for files in file_list:
+        parsed_files.update(load_into_tbl(driver, files))
+
+    with phase(driver.profiler, "output"):
+        write_shards(
+            parsed_files,
+            directory,
+            lambda shard_tbl, shard_file_name: write_tbl(driver, shard_tbl, shard_file_name),
+            scheme,
+            size,
+            ext,
+        )
+
+    return 0
+
+
+def generate_delta(driver, diff, expected, subset=False) -> OrderedDict:
+    """only keeps what changed from the golden, the new and missing entries and the
+    values that differ, apply_delta patches the golden with it
+
+    Args:
+        driver (ParseDriver): the driver used for the diff
+        diff (OrderedDict): the diff from ParseDriver.do_diff
+        expected (OrderedDict): the golden table
+        subset (bool, optional): missing entries are expected and not recorded. Defaults to False.
+
+    Returns:
+        OrderedDict: the delta
+    """
+    golden_headers = OrderedDict()
+    for entry in expected:
+        for header in expected[entry]:
+            golden_headers[header] = True
+
+    header_list = driver.get_header_list()
+    new_headers = [header for header in header_list if header not in golden_headers]
+    missing_headers = [header for header in golden_headers if header not in header_list]
+
+    delta = OrderedDict()
+    delta["__HEADERS__"] = OrderedDict([("new", new_headers), ("missing", missing_headers)])
+    delta["__NEW__"] = OrderedDict()
+    delta["__MISSING__"] = []
+    delta["__CHANGED__"] = OrderedDict()
+
+    for entry in diff:
+        entries = diff[entry]["__ENTRIES__"]
+        if diff[entry]["__STATUS__"] == "New":
+            delta["__NEW__"][entry] = OrderedDict(
+                [(header, entries[header]["__GOT__"]) for header in entries]
+            )
+
+        elif diff[entry]["__STATUS__"] == "Missing":
+            if not subset:
+                delta["__MISSING__"].append(entry)
+
+        else:
+            changed = OrderedDict()
+            for header in entries:
+                # new headers are never in the golden, so we record them even if they passed
+                if entries[header]["__STATUS__"] != "Ok" or (
+                    header in new_headers and entries[header]["__GOT__"] is not None
+                ):
+                    changed[header] = entries[header]["__GOT__"]
+
+            if len(changed) > 0:
+                delta["__CHANGED__"][entry] = changed
+
+    return delta
+
+
+def apply_delta(golden_result_file_name, delta_file_name, output_file_name=None):
+    """patches a json golden with a delta from compare, the golden is streamed entry by
+    entry so only the delta is held in memory
+
+    Args:
+        golden_result_file_name (str): the golden to patch
+        delta_file_name (str): the delta to apply
+        output_file_name (str, optional): where to write the patched golden.
+            Defaults to patching the golden in place.
+    """
+    assertion(
+        table_format(golden_result_file_name) == ".json",
+        "only json goldens can be patched: " + golden_result_file_name,
+    )
+
+    if output_file_name is None:
+        output_file_name = golden_result_file_name
+
+    delta = load_json(delta_file_name)
+    missing_headers = delta["__HEADERS__"]["missing"]
+    missing_entries = set(delta["__MISSING__"])
+
+    def _patched():
+        default_tbl = None
+        for entry, values in iter_json(golden_result_file_name):
+            # keep the defaults for the end, after the new entries
+            if entry == "DEFAULT":
+                default_tbl = values
+                continue
+
+            if entry in missing_entries:
+                continue
+
+            if entry in delta["__CHANGED__"]:
+                values.update(delta["__CHANGED__"][entry])
+
+            for header in missing_headers:
+                values.pop(header, None)
+
+            yield entry, values
+
+        for entry, values in delta["__NEW__"].items():
+            yield entry, values
+
+        if default_tbl is not None:
+            for header in missing_headers:
+                default_tbl.pop(header, None)
+
+            yield "DEFAULT", default_tbl
+
+    # write next to the output and swap it in once done, this allows patching in place,
+    # the temporary file ends with the codec of the output so it is compressed the same way
+    tmp_file_name = output_file_name + ".tmp" + (compression_of(output_file_name) or "")
+    with open_table(tmp_file_name, "w") as output_file:
+        dump_json_stream(_patched(), file=output_file)
+
+    os.replace(tmp_file_name, output_file_name)
+
+    # the rows changed under the fingerprints of the golden
+    if os.path.isfile(output_file_name + FINGERPRINT_EXT):
+        os.remove(output_file_name + FINGERPRINT_EXT)
+
+    return 0
+
+
+def make_reporter(report, colorize=True, junit_file_name=None, json_file_name=None):
+    reporter_list = []
+    if report == "text":
+        reporter_list.append(TextReporter(colorize))
+    elif report == "failures":
+        reporter_list.append(TextReporter(colorize, failures_only=True))
+    elif report == "summary":
+        reporter_list.append(SummaryReporter())
+
+    if junit_file_name is not None:
+        reporter_list.append(JUnitReporter(junit_file_name))
+
+    if json_file_name is not None:
+        reporter_list.append(JsonReporter(json_file_name))
+
+    return MultiReporter(reporter_list)
+
+
+def write_profile(profiler, file_name):
+    if file_name == "-":
+        profiler.dump(file=sys.stderr)
+    else:
+        with open(file_name, "w+") as profile_file:
+            profiler.dump(file=profile_file)
+
+
 def main():
 
     parser = argparse.ArgumentParser(description="Process some integers.")
-    parser.add_argument("action", choices=["display", "parse", "join", "compare"])
+    parser.add_argument(
+        "action",
+        choices=[
+            "display",
+            "parse",
+            "join",
+            "compare",
+            "apply",
+            "update-golden",
+            "shard",
+            "stats",
+        ],
+    )
     parser.add_argument(
         "--csv", default=False, action="store_true", help="output as a csv rather than JSON"
     )
@@ -244,6 +458,155 @@ def main():
         help="disable errors on missing test since we are only running a part of it",
     )
 
+    parser.add_argument(
+        "--delta",
+        dest="delta",
+        action="store_true",
+        default=False,
+        help="write only the new, missing and changed entries in the diff file, see apply",
+    )
+
+    parser.add_argument(
+        "--shard-scheme",
+        dest="shard_scheme",
+        default=SCHEME_HASH,
+        choices=[SCHEME_HASH, SCHEME_PREFIX],
+        help="how shard partitions the keys, on a hash of the key or on its prefix",
+    )
+
+    parser.add_argument(
+        "--shard-size",
+        dest="shard_size",
+        default=64,
+        type=int,
+        metavar=("N"),
+        help="the number of shards for hash or the length of the prefix for prefix",
+    )
+
+    parser.add_argument(
+        "--shard-format",
+        dest="shard_ext",
+        default=".json",
+        choices=[ext + codec for ext in (".json", ".jsonl") for codec in [""] + CODECS],
+        help="the table format of the shard files, optionally compressed",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="output",
+        default=None,
+        type=str,
+        metavar=("output_file"),
+        help="write the parsed table to the file rather than stdout, .jsonl is written as json lines",
+    )
+
+    parser.add_argument(
+        "--report",
+        dest="report",
+        default="text",
+        choices=["text", "failures", "summary", "none"],
+        help="what compare writes to stdout, every entry, only the failures, the totals or nothing",
+    )
+
+    parser.add_argument(
+        "--junit",
+        dest="junit",
+        default=None,
+        type=str,
+        metavar=("xml_file"),
+        help="also write the comparison as a junit xml report",
+    )
+
+    parser.add_argument(
+        "--json-report",
+        dest="json_report",
+        default=None,
+        type=str,
+        metavar=("jsonl_file"),
+        help="also write the comparison as json lines, one per entry followed by the totals",
+    )
+
+    parser.add_argument(
+        "--infer-default",
+        dest="infer_default",
+        action="store_true",
+        default=False,
+        help="compress the JSON output using the most frequent value of each column as its default",
+    )
+
+    parser.add_argument(
+        "--compression-level",
+        dest="compression_level",
+        default=None,
+        type=int,
+        metavar=("N"),
+        help="the level of the compressed outputs (.gz, .xz, .bz2, .zst), "
+        + "the default of the codec when unset",
+    )
+
+    parser.add_argument(
+        "--compression-threads",
+        dest="compression_threads",
+        default=0,
+        type=int,
+        metavar=("N"),
+        help="compress the outputs on N threads when the codec allows it (.zst)",
+    )
+
+    parser.add_argument(
+        "--fingerprint-file",
+        dest="fingerprint_file",
+        action="store_true",
+        default=False,
+        help="write the row fingerprints of JSON outputs in a .fp sidecar, comparing against "
+        + "such a golden skips hashing it",
+    )
+
+    parser.add_argument(
+        "--line-cache",
+        dest="line_cache",
+        default=None,
+        type=int,
+        metavar=("N"),
+        help="memoize the header captures of the last N distinct lines, 0 disables it",
+    )
+
+    parser.add_argument(
+        "--group-prefix",
+        dest="group_prefix",
+        default=0,
+        type=int,
+        metavar=("N"),
+        help="stats are grouped on the first N characters of the keys",
+    )
+
+    parser.add_argument(
+        "--quantiles",
+        dest="quantiles",
+        default="0.5,0.9,0.99",
+        help="the comma separated quantiles stats estimates",
+    )
+
+    parser.add_argument(
+        "--diff-jobs",
+        dest="diff_jobs",
+        default=0,
+        type=int,
+        metavar=("N"),
+        help="run the comparators in N worker processes, for comparators doing real work",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        dest="load_jobs",
+        default=0,
+        type=int,
+        metavar=("N"),
+        help="parse the logs compared in up to N worker processes, "
+        + "only worth it for several or large logs",
+    )
+
     parser.add_argument(
         "-C",
         "--conf",
@@ -295,9 +658,89 @@ def main():
         help="import python file",
     )
 
-    parser.add_argument("file_list", nargs="+", metavar=("input_file"), help="list of input files")
+    parser.add_argument(
+        "--profile",
+        dest="profile",
+        default=None,
+        type=str,
+        metavar=("json_file"),
+        help="write per phase, per hook and per header timings as JSON to the file, '-' for stderr",
+    )
+
+    parser.add_argument(
+        "--manifest",
+        dest="manifest",
+        default=[],
+        type=str,
+        action="append",
+        metavar=("manifest_file"),
+        help="read more input files from the manifest, one per line, '-' reads from stdin",
+    )
+
+    parser.add_argument(
+        "--null",
+        dest="null_separated",
+        default=False,
+        action="store_true",
+        help="the manifests are NUL separated rather than newline separated",
+    )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--include",
+        dest="include",
+        default=[],
+        type=str,
+        action="append",
+        metavar=("glob"),
+        help="only pick the files matching the glob when walking input directories",
+    )
+
+    parser.add_argument(
+        "--exclude",
+        dest="exclude",
+        default=[],
+        type=str,
+        action="append",
+        metavar=("glob"),
+        help="skip the files and directories matching the glob when walking input directories",
+    )
+
+    parser.add_argument(
+        "--async-io",
+        dest="concurrency",
+        default=0,
+        type=int,
+        metavar=("N"),
+        help="read up to N input logs concurrently while parsing, for high latency file systems",
+    )
+
+    parser.add_argument(
+        "--read-ahead",
+        dest="read_ahead",
+        default=64,
+        type=int,
+        metavar=("N"),
+        help="how many input logs --async-io can hold in memory ahead of the parser",
+    )
+
+    parser.add_argument(
+        "file_list",
+        nargs="*",
+        metavar=("input_file"),
+        help="list of input files, directories are walked recursively",
+    )
+
+    # the inputs can follow the options, the manifests can stand in for them
+    args = parser.parse_intermixed_args()
+
+    # patching a golden does not need the parser
+    if args.action in ("apply", "update-golden"):
+        if len(args.file_list) not in (2, 3):
+            print("Expected 2 or 3 files to apply a delta <golden> <delta> [output]", file=sys.stderr)
+            print(parser.print_help(), file=sys.stderr)
+            return -1
+
+        return apply_delta(*args.file_list)
 
     if len(args.conf) < 1:
         print("Expected at least one configuration file to drive the parser", file=sys.stderr)
@@ -308,13 +751,28 @@ def main():
         args.conf, args.import_file, args.preprocess_fn, args.process_fn, args.postprocess_fn
     )
 
+    if args.profile is not None:
+        driver.set_profiler(Profiler())
+
+    if args.infer_default:
+        driver.infer_default = True
+
+    if args.fingerprint_file:
+        driver.fingerprint_file = True
+
+    driver.compression_level = args.compression_level
+    driver.compression_threads = args.compression_threads
+
+    if args.line_cache is not None:
+        driver.set_match_cache(args.line_cache)
+
     if args.action == "compare":
         if len(args.file_list) != 3:
             print("Expected 3 files to do the comparison <golden> <result> <diff>", file=sys.stderr)
             print(parser.print_help(), file=sys.stderr)
             return -1
 
-        return compare(
+        ret = compare(
             driver,
             args.file_list[0],
             args.file_list[1],
@@ -322,10 +780,73 @@ def main():
             args.csv,
             args.subset,
             args.colorize,
+            args.load_jobs,
+            args.delta,
+            make_reporter(args.report, args.colorize, args.junit, args.json_report),
+            args.diff_jobs,
+        )
+
+    elif args.action == "shard":
+        if len(args.file_list) < 2:
+            print("Expected the tables to shard and the output directory", file=sys.stderr)
+            print(parser.print_help(), file=sys.stderr)
+            return -1
+
+        ret = shard(
+            driver,
+            args.file_list[:-1],
+            args.file_list[-1],
+            args.shard_scheme,
+            args.shard_size,
+            args.shard_ext,
         )
 
     else:
-        return parse(driver, args.file_list, args.csv)
+        if len(args.file_list) < 1 and len(args.manifest) < 1:
+            print("Expected at least one input file or manifest to parse", file=sys.stderr)
+            print(parser.print_help(), file=sys.stderr)
+            return -1
+
+        input_files = iter_inputs(
+            args.file_list, args.manifest, args.null_separated, args.include, args.exclude
+        )
+        if args.action == "join" and args.output is not None and args.output.endswith(".jsonl"):
+            input_files = list(input_files)
+
+        if args.action == "stats":
+            quantiles = [float(fraction) for fraction in args.quantiles.split(",")]
+            assertion(
+                all([0.0 <= fraction <= 1.0 for fraction in quantiles]),
+                "--quantiles are expected to be between 0 and 1",
+            )
+            ret = stats(
+                driver,
+                input_files,
+                args.group_prefix,
+                quantiles,
+                args.concurrency,
+                args.read_ahead,
+                args.output,
+            )
+
+        # json lines tables are simply concatenated
+        elif isinstance(input_files, list) and all(
+            [files.endswith(".jsonl") for files in input_files]
+        ):
+            concat_jsonl(input_files, args.output)
+            ret = 0
+        else:
+            ret = parse(
+                driver, input_files, args.csv, args.concurrency, args.read_ahead, args.output
+            )
+
+    if driver.profiler is not None:
+        if driver.match_cache is not None:
+            driver.profiler.set_counters("line_cache", driver.match_cache.stats())
+
+        write_profile(driver.profiler, args.profile)
+
+    return ret
 
 
 if __name__ == "__main__":
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+
+"""[summary]
+lets the tests import libparselog and parselog from the checkout, and build drivers from
+toml written on the fly
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from libparselog.api import open_driver  # noqa: E402
+
+
+@pytest.fixture
+def make_driver(tmp_path):
+    """builds a driver from the toml given as a string, along with the python files to import"""
+    toml_count = 0
+
+    def _make_driver(toml: str, import_list=None):
+        nonlocal toml_count
+        toml_count += 1
+        toml_file = tmp_path / ("driver_" + str(toml_count) + ".toml")
+        toml_file.write_text(toml)
+        return open_driver([str(toml_file)], import_list)
+
+    return _make_driver
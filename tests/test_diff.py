@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+"""[summary]
+comparing in worker processes gives the same diff as comparing in turn
+"""
+
+# We use OrderedDict in place of dict to
+# keep the ordering from the toml
+from collections import OrderedDict
+
+import pytest
+
+_COMPARATORS = """
+def within_diff(args, expected, got):
+    return abs(expected - got) <= args
+"""
+
+_TOML = """
+[name]
+regex = "name (\\S+)"
+key = true
+
+[time]
+regex = "time ([0-9.]+)"
+compare = { "within_diff": 0.5 }
+
+[steps]
+regex = "step (\\d+)"
+listing = true
+
+[status]
+regex = "status (\\S+)"
+"""
+
+
+def _tables():
+    expected = OrderedDict()
+    got = OrderedDict()
+    for index in range(40):
+        name = "run" + str(index)
+        row = OrderedDict(
+            [("name", name), ("time", index), ("steps", [1, 2, 3]), ("status", "ok")]
+        )
+        expected[name] = row
+
+        # some are off, some within the tolerance, some missing and some new
+        if index % 5 == 1:
+            continue
+
+        row = OrderedDict(row)
+        if index % 5 == 2:
+            row["time"] = index + 0.25
+        elif index % 5 == 3:
+            row["time"] = index + 2
+        elif index % 5 == 4:
+            row["steps"] = [1, 2]
+            row["status"] = "failed"
+        got[name] = row
+
+    got["new"] = OrderedDict([("name", "new"), ("time", 1), ("steps", []), ("status", "ok")])
+    return expected, got
+
+
+@pytest.mark.parametrize("jobs", [2, 3])
+@pytest.mark.parametrize("chunk_size", [1, 7, 256])
+def test_serial_jobs(tmp_path, make_driver, jobs, chunk_size):
+    comparators = tmp_path / "diff_comparators.py"
+    comparators.write_text(_COMPARATORS)
+    driver = make_driver(_TOML, [str(comparators)])
+
+    expected, got = _tables()
+    serial = list(driver.iter_diff(expected, got, jobs=0))
+    parallel = list(driver.iter_diff(expected, got, jobs=jobs, chunk_size=chunk_size))
+
+    assert parallel == serial
+    statuses = set([diff["__STATUS__"] for _, diff in serial])
+    assert len(statuses) > 2
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+"""[summary]
+the streamed json is what dump_json writes, and streams back to the same table
+"""
+
+# We use OrderedDict in place of dict to
+# keep the ordering from the toml
+from collections import OrderedDict
+
+import io
+
+from array import array
+
+import pytest
+
+from libparselog import utils
+from libparselog.compression import open_table
+from libparselog.utils import dump_json, dump_json_stream, iter_json, load_json
+
+
+def _table():
+    tbl = OrderedDict()
+    for index in range(30):
+        tbl["run" + str(index)] = OrderedDict(
+            [
+                ("time", index * 1.5),
+                ("steps", list(range(index % 4))),
+                ("name", 'quoted "{run}", \\ and ' + chr(0xE9)),
+                ("nested", OrderedDict([("ok", index % 2 == 0), ("none", None)])),
+            ]
+        )
+
+    tbl["DEFAULT"] = OrderedDict([("time", -1), ("steps", [])])
+    return tbl
+
+
+@pytest.mark.parametrize("tbl", [_table(), OrderedDict()])
+def test_same_as_dump_json(tbl):
+    streamed = io.StringIO()
+    dump_json_stream(tbl.items(), file=streamed)
+    dumped = io.StringIO()
+    dump_json(tbl, file=dumped)
+
+    assert streamed.getvalue() == dumped.getvalue()
+
+
+@pytest.mark.parametrize("file_name", ["table.json", "table.json.gz"])
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+def test_round_trip(tmp_path, monkeypatch, file_name, chunk_size):
+    # small chunks cut the members, strings and numbers anywhere
+    monkeypatch.setattr(utils, "_CHUNK_SIZE", chunk_size)
+    tbl = _table()
+    table_file = str(tmp_path / file_name)
+    with open_table(table_file, "w") as output_file:
+        dump_json_stream(tbl.items(), file=output_file)
+
+    assert list(iter_json(table_file)) == list(tbl.items())
+    assert load_json(table_file) == tbl
+
+
+def test_series_round_trip(tmp_path):
+    # the numeric series are written as plain lists
+    table_file = str(tmp_path / "series.json")
+    with open(table_file, "w") as output_file:
+        row = OrderedDict([("loss", array("d", [0.5, 1.0]))])
+        dump_json_stream([("run", row)], output_file)
+
+    assert list(iter_json(table_file)) == [("run", OrderedDict([("loss", [0.5, 1.0])]))]
+
+
+def test_empty(tmp_path):
+    table_file = tmp_path / "empty.json"
+    table_file.write_text("{}\n")
+
+    assert list(iter_json(str(table_file))) == []
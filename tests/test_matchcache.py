@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+"""[summary]
+the line cache only spares matching the same lines again, the records are the same
+"""
+
+import pytest
+
+from libparselog.loader import load_log
+
+_TOML = """
+[name]
+regex = "name (\\S+)"
+key = true
+
+[time]
+regex = "time ([0-9.]+)"
+
+[steps]
+regex = "step (\\d+)"
+listing = true
+
+[status]
+regex = "status (\\S+)"
+first-match = true
+"""
+
+
+def _write_log(tmp_path):
+    lines = []
+    for run in ["a", "b", "c"]:
+        lines.append("name " + run)
+        # the same lines come back again and again, as in a real log
+        for step in range(50):
+            lines.append("step " + str(step % 5))
+            lines.append("status ok" if step % 7 else "status retry")
+            lines.append("time 1.5")
+
+    log_file = tmp_path / "run.log"
+    log_file.write_text("\n".join(lines) + "\n")
+    return str(log_file)
+
+
+@pytest.mark.parametrize("size", [1, 4, 1024])
+def test_cache_on_off(tmp_path, make_driver, size):
+    log_file = _write_log(tmp_path)
+
+    uncached = make_driver(_TOML)
+    uncached.set_match_cache(0)
+    cached = make_driver(_TOML)
+    cached.set_match_cache(size)
+
+    expected = [dict(record) for record in load_log(uncached, log_file)]
+    # twice, the second parse starts with a warm cache
+    assert [dict(record) for record in load_log(cached, log_file)] == expected
+    assert [dict(record) for record in load_log(cached, log_file)] == expected
+
+    # a single line is evicted by the next one, it never hits
+    if size > 1:
+        assert cached.match_cache.stats()["hits"] > 0
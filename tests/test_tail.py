@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+"""[summary]
+reading a log backwards gives what the forward parse does, whatever the line endings
+"""
+
+import pytest
+
+from libparselog.loader import load_log
+from libparselog.tail import iter_lines_reversed
+
+_TOML = """
+[name]
+regex = "name (\\S+)"
+key = true
+
+[time]
+regex = "time ([0-9.]+)"
+
+[peak]
+regex = "peak (\\d+)"
+"""
+
+_TAIL_TOML = (
+    _TOML
+    + """
+from-end = true
+"""
+)
+
+_LOGS = [
+    "name a\npeak 1\ntime 2\npeak 3\ntime 4\n",
+    "name a\r\npeak 1\r\ntime 2\r\npeak 3\r\ntime 4\r\n",
+    # no newline at the end of the last line
+    "name a\npeak 1\ntime 2\npeak 3\ntime 4",
+    "name a\r\npeak 1\r\n\r\npeak 3\r\ntime 4",
+    "",
+    "\n\n",
+]
+
+
+@pytest.mark.parametrize("content", _LOGS)
+@pytest.mark.parametrize("block_size", [1, 2, 5, 1 << 16])
+def test_lines_reversed(tmp_path, content, block_size):
+    log_file = tmp_path / "run.log"
+    log_file.write_bytes(content.encode())
+
+    with open(log_file) as log:
+        forward = log.readlines()
+
+    with open(log_file, "rb") as log:
+        backward = list(iter_lines_reversed(log, block_size))
+
+    assert backward == forward[::-1]
+
+
+@pytest.mark.parametrize("content", _LOGS[:4])
+def test_from_end_parse(tmp_path, make_driver, content):
+    log_file = tmp_path / "run.log"
+    log_file.write_bytes(content.encode())
+
+    forward = list(load_log(make_driver(_TOML), str(log_file)))
+    backward = list(load_log(make_driver(_TAIL_TOML), str(log_file)))
+
+    assert [dict(record) for record in backward] == [dict(record) for record in forward]
+    assert backward[0]["peak"] == 3
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+"""[summary]
+the TRANSFORM entry, starting with the example the module documents
+"""
+
+# We use OrderedDict in place of dict to
+# keep the ordering from the toml
+from collections import OrderedDict
+
+from libparselog import transform
+from libparselog.toml import Toml
+from libparselog.transform import compile_transform
+
+
+def _documented_example() -> str:
+    # the indented toml block of the module docstring
+    doc = transform.__doc__
+    start = doc.index("[TRANSFORM]")
+    end = doc.index("\n\n", start)
+    return "\n".join([line.strip() for line in doc[start:end].splitlines()])
+
+
+def test_documented_example():
+    conf = Toml().loads(_documented_example())
+    line_transform = compile_transform(conf["TRANSFORM"])
+
+    assert line_transform("[INFO] \x1b[1m12:00:01.5 time 12\x1b[0m\r") == "time 12"
+    assert line_transform("[WARN] 12:00:02 peak 7") == "peak 7"
+    # only the leading timestamp goes
+    assert line_transform("[DEBUG] step 3") == "[DEBUG] step 3"
+
+
+def test_empty_transform():
+    assert compile_transform(OrderedDict()) is None
+
+
+def test_order():
+    line_transform = compile_transform(
+        OrderedDict(
+            [
+                ("strip-prefix", ["[INFO] "]),
+                ("delete", "\\t"),
+                ("substitute", [["a+", "b"], ["b+", "c"]]),
+            ]
+        )
+    )
+
+    assert line_transform("[INFO] \taab\t") == "c"